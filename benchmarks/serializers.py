@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# benchmarks/serializers.py
+# Micro-benchmark of compiled serializers against flask_restx.marshal
+import argparse
+import datetime
+import timeit
+
+from flask_api_sqlalchemy import Api
+from flask_api_sqlalchemy.serializers import compile_serializer
+from flask_restx import fields, marshal
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    Text,
+    inspect,
+)
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Record(Base):
+    __tablename__ = "record"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    description = Column(Text)
+    price = Column(Float)
+    quantity = Column(Integer)
+    is_active = Column(Boolean, nullable=False)
+    created = Column(DateTime)
+    shipped = Column(Date)
+
+
+def build_api_model() -> dict:
+    """Map the model's columns the same way `Api._generate_api_models` does."""
+    api = Api()
+    model_fields = {}
+    for column in inspect(Record).columns:
+        if column.primary_key:
+            model_fields[column.name] = fields.Integer(readonly=True)
+        else:
+            model_fields[column.name] = api._map_sqlalchemy_type_to_restx_field(
+                column.type, column.nullable
+            )
+    return model_fields
+
+
+def build_rows(count: int) -> list:
+    """Create transient ORM objects to serialize."""
+    now = datetime.datetime(2025, 1, 1, 12, 30)
+    return [
+        Record(
+            id=index,
+            name=f"record {index}",
+            description="x" * 200,
+            price=index * 1.5,
+            quantity=index % 17,
+            is_active=index % 2 == 0,
+            created=now,
+            shipped=now.date() if index % 3 else None,
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare compiled serializers with flask_restx.marshal"
+    )
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    model_fields = build_api_model()
+    rows = build_rows(args.rows)
+    serialize = compile_serializer(model_fields)
+    assert [serialize(row) for row in rows] == marshal(rows, model_fields)
+
+    def run_marshal():
+        marshal(rows, model_fields)
+
+    def run_compiled():
+        [serialize(row) for row in rows]
+
+    marshal_time = min(timeit.repeat(run_marshal, number=1, repeat=args.repeat))
+    compiled_time = min(timeit.repeat(run_compiled, number=1, repeat=args.repeat))
+
+    print(f"rows:      {args.rows}")
+    print(f"marshal:   {marshal_time / args.rows * 1e6:8.2f} us/row")
+    print(f"compiled:  {compiled_time / args.rows * 1e6:8.2f} us/row")
+    print(f"speedup:   {marshal_time / compiled_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
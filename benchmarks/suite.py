@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+# benchmarks/suite.py
+# Latency and throughput suite of the generated CRUD endpoints, with baselines
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from importlib.metadata import version
+from typing import Callable, Dict, List, Optional
+
+import sqlalchemy
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    Text,
+    insert,
+    select,
+)
+from sqlalchemy.orm import declarative_base
+
+from flask_api_sqlalchemy import Api, __version__
+from flask_api_sqlalchemy.registry import ModelRegistry
+
+Base = declarative_base()
+
+CREATED = datetime.datetime(2025, 1, 1, 12, 30)
+
+
+class Record(Base):
+    __tablename__ = "bench_record"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    description = Column(Text)
+    price = Column(Float)
+    quantity = Column(Integer)
+    is_active = Column(Boolean, nullable=False)
+    created = Column(DateTime)
+
+
+def record_values(index: int) -> dict:
+    """Column values of the `index`th generated row."""
+    return {
+        "name": f"record {index}",
+        "description": "x" * 200,
+        "price": index * 1.5,
+        "quantity": index % 17,
+        "is_active": index % 2 == 0,
+        "created": CREATED,
+    }
+
+
+def record_payload(index: int) -> dict:
+    """JSON body creating one record through the API."""
+    values = record_values(index)
+    del values["created"]  # Datetime strings are not parsed on input
+    return values
+
+
+def build_app(uri: str, **options) -> Flask:
+    """Create an app serving `Record` with the given `Api` options."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri
+    db = SQLAlchemy(app)
+    Api(registry=ModelRegistry.discover(Base), **options).init_app(app, db)
+    return app
+
+
+def fill(app: Flask, rows: int) -> None:
+    """Insert rows until the table holds `rows` of them."""
+    with app.app_context():
+        db = app.extensions["sqlalchemy"]
+        present = db.session.execute(select(sqlalchemy.func.count(Record.id))).scalar()
+        for start in range(present, rows, 10_000):
+            stop = min(start + 10_000, rows)
+            db.session.execute(
+                insert(Record), [record_values(index) for index in range(start, stop)]
+            )
+        db.session.commit()
+
+
+def measure(run: Callable[[int], None], iterations: int, warmup: int = 3) -> dict:
+    """Time `iterations` calls of `run`, after a few untimed ones.
+
+    Args:
+        run (Callable[[int], None]): Operation, given the iteration number
+        iterations (int): Timed calls
+        warmup (int): Untimed calls first
+
+    Returns:
+        dict: Operations per second, and mean, median and p95 latency
+    """
+    for index in range(warmup):
+        run(-1 - index)
+    samples = []
+    for index in range(iterations):
+        start = time.perf_counter()
+        run(index)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / sum(samples), 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 4),
+        "p95_ms": round(samples[math.ceil(len(samples) * 0.95) - 1] * 1000, 4),
+    }
+
+
+def request(client, method: str, url: str, status: int, **kwargs) -> Callable:
+    """Build an operation sending one request and checking its status."""
+
+    def run(index: int) -> None:
+        response = client.open(
+            url(index) if callable(url) else url, method=method, **kwargs
+        )
+        response.get_data()  # Streamed bodies are only produced when read
+        assert response.status_code == status, (url, response.status_code)
+
+    return run
+
+
+def endpoint_cases(uri: str, args: argparse.Namespace) -> Dict[str, dict]:
+    """Benchmark the list, item, create and bulk write endpoints."""
+    results = {}
+    app = build_app(uri, paginate=True, page_size=args.page_size)
+    with app.app_context():
+        db = app.extensions["sqlalchemy"]
+        Base.metadata.drop_all(db.engine)
+        Base.metadata.create_all(db.engine)
+    client = app.test_client()
+    # Same table, listed whole: as one JSON body, or streamed in batches
+    whole = build_app(uri, streaming=True).test_client()
+
+    rows = 0
+    for rows in sorted(args.sizes):
+        fill(app, rows)
+        run = request(client, "GET", "/api/records/", 200)
+        results[f"list_page_{rows}"] = measure(run, args.iterations)
+        print_result(f"list_page_{rows}", results[f"list_page_{rows}"])
+
+        # Every row is read each time, so fewer runs on large tables
+        iterations = max(min(args.iterations, args.iterations * 1_000 // rows), 3)
+        for name, url in (
+            ("list_all", "/api/records/"),
+            ("list_stream", "/api/records/?stream=ndjson"),
+        ):
+            run = request(whole, "GET", url, 200)
+            results[f"{name}_{rows}"] = measure(run, iterations, warmup=1)
+            print_result(f"{name}_{rows}", results[f"{name}_{rows}"])
+
+    ids = [random.randint(1, rows) for _ in range(args.iterations + 3)]
+    run = request(client, "GET", lambda index: f"/api/records/{ids[index]}", 200)
+    results["item_get"] = measure(run, args.iterations)
+    print_result("item_get", results["item_get"])
+
+    def create(index: int) -> None:
+        response = client.post("/api/records/", json=record_payload(index))
+        assert response.status_code == 201, response.status_code
+
+    results["create"] = measure(create, args.iterations)
+    print_result("create", results["create"])
+
+    bulk = [record_payload(index) for index in range(args.bulk_size)]
+    run = request(client, "POST", "/api/records/", 201, json=bulk)
+    results[f"bulk_create_{args.bulk_size}"] = measure(
+        run, max(args.iterations // 10, 5), warmup=1
+    )
+    print_result(
+        f"bulk_create_{args.bulk_size}", results[f"bulk_create_{args.bulk_size}"]
+    )
+    results.update(bulk_write_cases(app, client, args))
+
+    with app.app_context():
+        Base.metadata.drop_all(app.extensions["sqlalchemy"].engine)
+    return results
+
+
+def bulk_write_cases(app: Flask, client, args: argparse.Namespace) -> Dict[str, dict]:
+    """Benchmark bulk PATCH and DELETE of `--bulk-size` rows at a time."""
+    results = {}
+    size = args.bulk_size
+    iterations = max(args.iterations // 10, 5)
+
+    def write(method: str, body: Callable[[int], dict]) -> Callable:
+        def run(index: int) -> None:
+            response = client.open("/api/records/", method=method, json=body(index))
+            assert response.status_code == 200, response.status_code
+            assert response.json["affected"] == size, response.json
+
+        return run
+
+    update = write(
+        "PATCH",
+        lambda index: {"filter": {"id__lte": size}, "values": {"quantity": index}},
+    )
+    results[f"bulk_update_{size}"] = measure(update, iterations, warmup=1)
+    print_result(f"bulk_update_{size}", results[f"bulk_update_{size}"])
+
+    # Each run deletes a fresh block of rows appended for it
+    with app.app_context():
+        db = app.extensions["sqlalchemy"]
+        top = db.session.execute(select(sqlalchemy.func.max(Record.id))).scalar()
+        present = db.session.execute(select(sqlalchemy.func.count(Record.id))).scalar()
+    fill(app, present + (iterations + 1) * size)
+
+    def block(index: int) -> dict:
+        start = top + (index + 1) * size  # Warmup run has index -1
+        return {"filter": {"id__gt": start, "id__lte": start + size}}
+
+    results[f"bulk_delete_{size}"] = measure(
+        write("DELETE", block), iterations, warmup=1
+    )
+    print_result(f"bulk_delete_{size}", results[f"bulk_delete_{size}"])
+    return results
+
+
+def marshal_cases(uri: str, args: argparse.Namespace) -> Dict[str, dict]:
+    """Benchmark serializing rows already loaded, without HTTP or SQL."""
+    results = {}
+    for name, fast in (("marshal", False), ("marshal_compiled", True)):
+        app = build_app(uri, fast_serializers=fast)
+        api = app.extensions["flask-api-sqlalchemy"]
+        rows = [Record(id=index, **record_values(index)) for index in range(1000)]
+        with app.test_request_context():
+            api_model = api.api_models["Record"]
+            run = lambda index: api._marshal(rows, api_model)  # noqa: E731
+            results[f"{name}_1000"] = measure(run, max(args.iterations // 10, 5))
+        print_result(f"{name}_1000", results[f"{name}_1000"])
+    return results
+
+
+def startup_cases(uri: str, args: argparse.Namespace) -> Dict[str, dict]:
+    """Benchmark `init_app` with many models, eagerly and in lazy mode."""
+    results = {}
+    for count in args.model_counts:
+        base = declarative_base()
+        # Mappers only hold weak references to their classes
+        models = [
+            type(
+                f"Model{index}",
+                (base,),
+                {
+                    "__tablename__": f"model_{index}",
+                    "id": Column(Integer, primary_key=True),
+                    "name": Column(String(100), nullable=False),
+                    "value": Column(Float),
+                },
+            )
+            for index in range(count)
+        ]
+        registry = ModelRegistry.discover(base)
+        assert len(registry) == len(models)
+
+        for name, lazy in (("startup", False), ("startup_lazy", True)):
+
+            def run(index: int, lazy: bool = lazy) -> None:
+                app = Flask(__name__)
+                app.config["SQLALCHEMY_DATABASE_URI"] = uri
+                Api(registry=registry, lazy=lazy).init_app(app, SQLAlchemy(app))
+
+            key = f"{name}_{count}_models"
+            results[key] = measure(run, args.startup_iterations, warmup=1)
+            print_result(key, results[key])
+    return results
+
+
+def print_result(name: str, result: dict) -> None:
+    """Print one line of results."""
+    print(
+        f"{name:<28} {result['ops_per_sec']:>10.1f} ops/s"
+        f"   p50 {result['p50_ms']:>9.3f} ms   p95 {result['p95_ms']:>9.3f} ms"
+    )
+
+
+def compare(results: Dict[str, dict], baseline: dict, tolerance: float) -> int:
+    """Print the p50 change of every case against a baseline.
+
+    Args:
+        results (Dict[str, dict]): Results of this run, by case
+        baseline (dict): Output of an earlier run
+        tolerance (float): Slowdown allowed before a case counts as a
+            regression, as a fraction (0.2 is 20% slower)
+
+    Returns:
+        int: Number of regressed cases
+    """
+    regressions = 0
+    print(f"\nagainst baseline of {baseline['meta']['timestamp']}:")
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<28} (new)")
+            continue
+        change = result["p50_ms"] / before["p50_ms"] - 1
+        regressed = change > tolerance
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<28} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the generated CRUD endpoints and compare with a baseline"
+    )
+    parser.add_argument(
+        "--database-url",
+        help="Database to run against, e.g. postgresql://localhost/bench "
+        "(default: a temporary SQLite file); its bench_record table is dropped",
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--model-counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--startup-iterations", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--bulk-size", type=int, default=1_000)
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=["endpoints", "marshal", "startup"],
+        default=["endpoints", "marshal", "startup"],
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="p50 slowdown counted as a regression (default: 0.2, i.e. 20%%)",
+    )
+    args = parser.parse_args(argv)
+    random.seed(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        uri = args.database_url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        results = {}
+        if "endpoints" in args.cases:
+            results.update(endpoint_cases(uri, args))
+        if "marshal" in args.cases:
+            results.update(marshal_cases(uri, args))
+        if "startup" in args.cases:
+            results.update(startup_cases(uri, args))
+        dialect = sqlalchemy.make_url(uri).get_backend_name()
+
+    output = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "database": dialect,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "flask_api_sqlalchemy": __version__,
+            "flask": version("flask"),
+            "sqlalchemy": sqlalchemy.__version__,
+            "options": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("database_url", "output", "baseline")
+            },
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["meta"]["database"] != dialect:
+            print(f"\nbaseline ran on {baseline['meta']['database']}, not {dialect}")
+            return 2
+        return 1 if compare(results, baseline, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,80 @@
 # src/flask_api_sqlalchemy/api.py
 # Core API extension class
+import datetime
+import hashlib
+import json
 import logging
+import os
+import random
+import threading
+import time
+import uuid
+from functools import partial, wraps
 from http import HTTPStatus
-from typing import Any, Optional
+from itertools import chain, count
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import inflection
-from flask import Blueprint, Flask
+from flask import (
+    Blueprint,
+    Flask,
+    Response,
+    abort,
+    current_app,
+    g,
+    request,
+    stream_with_context,
+)
 from flask_restx import Api as RestxApi
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
+from flask_restx.utils import unpack
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import inspect
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Table, delete, func, insert, inspect, select, update
+from sqlalchemy.exc import DataError, IntegrityError, OperationalError
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from sqlalchemy.orm.exc import StaleDataError
+
+from .budget import STATS_ATTRIBUTE, QueryStats, instrument
+from .cache import CacheBackend, ResponseCache
+from .count import COUNT_MODES, estimated_count, exact_count
+from .exceptions import (
+    BulkWriteError,
+    ModelMappingError,
+    QueryBudgetError,
+    QueryError,
+    VersionConflictError,
+)
+from .metrics import METRICS_ATTRIBUTE, METRICS_CONTENT_TYPE, Metrics, RequestMetrics
+from .query import (
+    QueryBuilder,
+    decode_cursor,
+    encode_cursor,
+    keyset_predicate,
+    order_clauses,
+)
+from .registry import ModelRegistry
+from .serializers import compile_serializer
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Flask-RESTX internals lazy mode uses to install views after startup
+LAZY_RESTX_INTERNALS = (
+    "_configure_namespace_logger",
+    "mediatypes_method",
+    "_schema",
+    "_refresolver",
+)
+
+# Media type for newline-delimited JSON streams
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# URL converters of item route segments, by primary key column type
+ROUTE_CONVERTERS = {int: "int", uuid.UUID: "uuid"}
+
+# Cookie pinning a client's reads to the primary after its writes
+READ_PRIMARY_COOKIE = "api_read_primary"
+
 
 class Api:
     """flask-api-sqlalchemy extension class.
@@ -55,6 +115,43 @@ class Api:
         url_scheme: Optional[str] = None,
         want_logs: bool = False,
         disable_delete: bool = False,
+        paginate: bool = False,
+        page_size: int = 50,
+        max_page_size: int = 1000,
+        streaming: bool = False,
+        stream_batch_size: int = 1000,
+        require_indexed_filters: bool = False,
+        fast_serializers: bool = False,
+        core_reads: bool = False,
+        bulk_batch_size: int = 1000,
+        cache: Optional[CacheBackend] = None,
+        cache_ttl: Optional[int] = 60,
+        etags: bool = False,
+        fast_writes: bool = False,
+        max_expand_depth: int = 2,
+        batch_get_chunk_size: int = 1000,
+        count_mode: str = "none",
+        count_modes: Optional[Dict[str, str]] = None,
+        lazy: bool = False,
+        spec_file: Optional[str] = None,
+        registry: Optional[ModelRegistry] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        model_config: Optional[Dict[str, Dict[str, Any]]] = None,
+        reflect: bool = False,
+        reflect_schema: Optional[str] = None,
+        reflect_tables: Optional[List[str]] = None,
+        reflection_cache: Optional[str] = None,
+        read_replicas: Optional[List[Any]] = None,
+        replica_policy: str = "round_robin",
+        read_your_writes: int = 5,
+        replica_retry_after: int = 30,
+        query_budget: Optional[Union[int, Dict[str, int]]] = None,
+        query_budget_action: str = "log",
+        n_plus_one_threshold: int = 3,
+        metrics: bool = False,
+        metrics_path: str = "/metrics",
+        metrics_buckets: Optional[List[float]] = None,
         **kwargs,
     ) -> None:
         """Initialize the API extension.
@@ -62,6 +159,81 @@ class Api:
         Args:
             app (Optional[Flask]): Flask application instance
             db (Optional[SQLAlchemy]): SQLAlchemy instance
+            paginate (bool): Page collection listings with keyset cursors
+            page_size (int): Default number of rows per page
+            max_page_size (int): Largest page a client may request with `limit`
+            streaming (bool): Let clients stream whole collections as NDJSON
+                or as an incrementally written JSON array
+            stream_batch_size (int): Rows fetched per round trip while streaming
+            require_indexed_filters (bool): Reject filters and sorts on columns
+                that no database index covers
+            fast_serializers (bool): Serialize responses with serializers
+                compiled per model instead of `flask_restx.marshal`
+            core_reads (bool): Read collection listings with Core SELECTs on
+                the model's table, skipping ORM object loading
+            bulk_batch_size (int): Rows per INSERT statement when a JSON array
+                is posted to a collection
+            cache (Optional[CacheBackend]): Backend caching the responses of
+                the GET endpoints, such as `MemoryCache()` or `RedisCache(...)`
+            cache_ttl (Optional[int]): Seconds a response stays cached
+            etags (bool): Send ETags (and Last-Modified where a timestamp
+                version column exists) and answer conditional GETs with 304
+            fast_writes (bool): Update and delete items with one Core statement
+                each, without loading them through the ORM first
+            max_expand_depth (int): Deepest relationship path `expand=` may
+                embed (0 disables embedding)
+            batch_get_chunk_size (int): Identifiers per `WHERE pk IN (...)`
+                query when fetching items in a batch
+            count_mode (str): How collection listings compute the
+                `X-Total-Count` header: "exact", "estimated" or "none"
+            count_modes (Optional[Dict[str, str]]): Count modes overriding
+                `count_mode` for some models, by model name
+            lazy (bool): Only register routes at startup, and build each
+                model's API model and resources on its first request (or when
+                the Swagger spec is first rendered)
+            spec_file (Optional[str]): Swagger spec written by `export_spec`
+                (or `flask-api-sqlalchemy export-spec`), served instead of
+                generating the spec when the file exists
+            registry (Optional[ModelRegistry]): Models discovered beforehand
+                with `ModelRegistry.discover`, shared instead of discovering
+                them again in `init_app`
+            include (Optional[List[str]]): Glob patterns of the model names
+                to generate endpoints for (default: all)
+            exclude (Optional[List[str]]): Glob patterns of the model names
+                to skip
+            model_config (Optional[Dict[str, Dict[str, Any]]]): Per-model
+                options by class name or `module.QualifiedName`: `name`
+                (exposed name), `disable_delete` and `count_mode`
+            reflect (bool): Generate the API from the database's tables
+                instead of the declared models
+            reflect_schema (Optional[str]): Schema to reflect (default: the
+                default one)
+            reflect_tables (Optional[List[str]]): Names of the tables to
+                reflect (default: all)
+            reflection_cache (Optional[str]): File caching the reflected
+                tables across restarts
+            read_replicas (Optional[List[Any]]): Engines, or bind keys of
+                `SQLALCHEMY_BINDS`, that collection and item GETs read from
+                instead of the primary
+            replica_policy (str): How a GET picks its replica: "round_robin"
+                or "random"
+            read_your_writes (int): Seconds a client reads from the primary
+                after its own write through the API (0 disables)
+            replica_retry_after (int): Seconds a replica that failed is left
+                out before it is tried again
+            query_budget (Optional[Union[int, Dict[str, int]]]): Most SQL
+                statements a request may run, for every endpoint or by
+                endpoint name (e.g. "users_collection"); also counts them
+                into `X-DB-Queries` and `X-DB-Time` headers
+            query_budget_action (str): What to do when a request runs more
+                statements than its budget: "log" or "raise"
+            n_plus_one_threshold (int): Runs of the same statement in one
+                request that are logged as likely N+1 queries
+            metrics (bool): Record latency, rows, bytes and status metrics of
+                the generated endpoints, served at `metrics_path`
+            metrics_path (str): URL of the metrics in Prometheus text format
+            metrics_buckets (Optional[List[float]]): Upper bounds of the
+                latency histogram buckets, in seconds
         """
         self.app = app
         self.db = db
@@ -70,6 +242,10 @@ class Api:
         self.models = {}  # SQLAlchemy models
         self.api_models = {}  # Flask-RESTX API models
         self.namespaces = {}  # API namespaces
+        self.query_builders = {}  # Filter and sort compilers
+        self.serializers = {}  # Compiled serializers (with fast_serializers)
+        self._row_serializers = {}  # Same, reading Core row mappings
+        self.expansions = {}  # (model name, expand tree) -> fields to marshal with
         self.title = title
         self.description = description
         self.version = version
@@ -96,9 +272,59 @@ class Api:
         self.url_scheme = url_scheme
         self.want_logs = want_logs
         self.disable_delete = disable_delete
+        self.paginate = paginate
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.streaming = streaming
+        self.stream_batch_size = stream_batch_size
+        self.require_indexed_filters = require_indexed_filters
+        self.fast_serializers = fast_serializers
+        self.core_reads = core_reads
+        self.bulk_batch_size = bulk_batch_size
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.response_cache = (
+            ResponseCache(cache, cache_ttl) if cache is not None else None
+        )
+        self.etags = etags
+        self.fast_writes = fast_writes
+        self.max_expand_depth = max_expand_depth
+        self.batch_get_chunk_size = batch_get_chunk_size
+        self.count_mode = count_mode
+        self.count_modes = count_modes or {}
+        for mode in (count_mode, *self.count_modes.values()):
+            self._check_count_mode(mode)
+        self.lazy = lazy
+        self.spec_file = spec_file
+        self.registry = registry
+        self.include = include
+        self.exclude = exclude
+        self.model_config = model_config
+        self.reflect = reflect
+        self.reflect_schema = reflect_schema
+        self.reflect_tables = reflect_tables
+        self.reflection_cache = reflection_cache
+        self.read_replicas = read_replicas or []
+        self.replica_policy = replica_policy
+        self.read_your_writes = read_your_writes
+        self.replica_retry_after = replica_retry_after
+        self.query_budget = query_budget
+        self.query_budget_action = query_budget_action
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.metrics = metrics
+        self.metrics_path = metrics_path
+        self.metrics_buckets = metrics_buckets
         self.kwargs = kwargs
 
         self._api = None  # Flask-RESTX API instance
+        self._built = set()  # Names of the models whose resources exist (lazy)
+        self._build_lock = threading.RLock()
+        self._spec = None  # Serialized Swagger spec and its ETag
+        self._replica_turns = count()  # Round robin position
+        self._replicas_down = {}  # Replica index -> monotonic time to retry at
+        self._resources = {}  # Resource name -> model name
+        self._model_names = {}  # Model class -> model name
+        self._metrics = Metrics(metrics_buckets) if metrics else None
 
         # If app and db are provided, initialize the extension
         if app is not None and db is not None:
@@ -116,9 +342,24 @@ class Api:
         """
         self.app = app
         self.db = db
+        app.extensions["flask-api-sqlalchemy"] = self
 
         # Create API blueprint
         self.blueprint = Blueprint("SQLAlchemy API", __name__, url_prefix=self.prefix)
+        if self.read_replicas and self.read_your_writes:
+            self.blueprint.after_request(self._remember_write)
+        if self.query_budget is not None or self.metrics:
+            self.blueprint.before_request(self._start_query_stats)
+            with app.app_context():
+                self._instrument_engines()
+        if self.query_budget is not None:
+            self.blueprint.after_request(self._check_query_budget)
+        if self.metrics:
+            self.blueprint.before_request(self._start_request_metrics)
+            self.blueprint.after_request(self._record_metrics)
+            app.add_url_rule(
+                self.metrics_path, "flask_api_sqlalchemy_metrics", self._metrics_view
+            )
 
         # Create Flask-RESTX API
         self.api = RestxApi(
@@ -153,8 +394,26 @@ class Api:
             **self.kwargs,
         )
 
+        if self.lazy:
+            missing = [
+                name for name in LAZY_RESTX_INTERNALS if not hasattr(self.api, name)
+            ]
+            if missing:
+                raise RuntimeError(
+                    "lazy=True is not supported by this Flask-RESTX version "
+                    f"(missing {', '.join(missing)})"
+                )
+            # Routes now, everything else on first use
+            with app.app_context():
+                self._discover_models()
+                self._register_lazy_routes()
+            app.register_blueprint(self.blueprint)
+            self._register_spec_view()
+            return
+
         # Register the blueprint with the Flask app
         app.register_blueprint(self.blueprint)
+        self._register_spec_view()
 
         # Register models and create APIs
         with app.app_context():
@@ -164,19 +423,39 @@ class Api:
 
     def _discover_models(self) -> None:
         """Discover all SQLAlchemy models in the application."""
-        # Find all models defined in the SQLAlchemy instance
-        models = {}
+        # Walk the mappers of the SQLAlchemy instance, unless given the models
+        if self.registry is None and self.reflect:
+            self.registry = ModelRegistry.reflect(
+                self.db.engine,
+                schema=self.reflect_schema,
+                tables=self.reflect_tables,
+                cache_file=self.reflection_cache,
+                include=self.include,
+                exclude=self.exclude,
+                config=self.model_config,
+            )
+        elif self.registry is None:
+            self.registry = ModelRegistry.discover(
+                self.db.Model,
+                include=self.include,
+                exclude=self.exclude,
+                config=self.model_config,
+            )
+        models = dict(self.registry.models)
 
-        # Use Python's built-in __subclasses__ to find all model classes
-        for cls in self.db.Model.__subclasses__():
-            model_name = cls.__name__
-            if model_name != "Base" and not model_name.startswith("_"):
-                if self.want_logs:
-                    logger.info(f"Discovered model: {model_name}")
-                models[model_name] = cls
+        if self.want_logs:
+            for model_name in models:
+                logger.info(f"Discovered model: {model_name}")
 
         # Store discovered models
         self.models = models
+        self._resources = {
+            inflection.pluralize(model_name.lower()): model_name
+            for model_name in models
+        }
+        self._model_names = {model: model_name for model_name, model in models.items()}
+        for model_name in models:
+            self._check_count_mode(self._configured_count_mode(model_name))
 
         # If no models were found, log a warning
         if not models:
@@ -185,6 +464,198 @@ class Api:
                 + "Make sure your models are properly defined."
             )
 
+    def _register_spec_view(self) -> None:
+        """Serve the Swagger spec from `spec` instead of Flask-RESTX's view."""
+        endpoint = self.api.endpoint("specs")
+        if endpoint in self.app.view_functions:
+            self.app.view_functions[endpoint] = self._spec_view
+
+    def _spec_view(self) -> Response:
+        """Serve the cached Swagger spec, answering revalidations with 304."""
+        spec = self.spec()
+        if spec is None:
+            abort(HTTPStatus.INTERNAL_SERVER_ERROR, "Unable to render schema")
+        body, etag = spec
+        response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+    def spec(self) -> Optional[Tuple[bytes, str]]:
+        """Get the serialized Swagger spec and its ETag.
+
+        The spec is read from `spec_file` when that file exists, or else
+        generated (building every model in lazy mode) and serialized once
+        per process. Generating it needs a request context.
+
+        Returns:
+            Optional[Tuple[bytes, str]]: JSON body and ETag, or None when
+                Flask-RESTX cannot render the spec
+        """
+        if self._spec is None:
+            with self._build_lock:
+                if self._spec is None:
+                    if self.spec_file and os.path.exists(self.spec_file):
+                        with open(self.spec_file, "rb") as f:
+                            body = f.read()
+                    else:
+                        body = self._generate_spec()
+                        if body is None:
+                            return None
+                    self._spec = (body, hashlib.sha1(body).hexdigest())
+        return self._spec
+
+    def _generate_spec(self) -> Optional[bytes]:
+        """Render and serialize the Swagger spec of every model.
+
+        Returns:
+            Optional[bytes]: JSON body, or None when Flask-RESTX cannot
+                render the spec
+        """
+        self._build_models()
+        schema = self.api.__schema__
+        if "error" in schema:
+            return None
+        return json.dumps(schema).encode("utf-8")
+
+    def export_spec(self, path: str) -> None:
+        """Write the Swagger spec to a file, such as a build artifact.
+
+        Workers started with `spec_file=path` then serve the file without
+        generating the spec.
+
+        Args:
+            path (str): File to write
+        """
+        with self.app.test_request_context():
+            body = self._generate_spec()
+        if body is None:
+            raise RuntimeError("Unable to render the Swagger spec")
+        with open(path, "wb") as f:
+            f.write(body)
+
+    def _model_routes(
+        self, model_name: str, model: Any
+    ) -> List[Tuple[str, str, List[str]]]:
+        """List the routes `_create_endpoints` registers for a model.
+
+        Args:
+            model_name (str): Name of the model
+            model (Any): SQLAlchemy model class
+
+        Returns:
+            List[Tuple[str, str, List[str]]]: (rule, endpoint, methods) triples
+        """
+        resource_name = inflection.pluralize(model_name.lower())
+        disable_delete = self.registry.option(
+            model_name, "disable_delete", self.disable_delete
+        )
+        deletes = [] if disable_delete else ["DELETE"]
+        item_route, _ = self._item_route(model)
+        return [
+            (
+                f"/{resource_name}/",
+                f"{resource_name}_collection",
+                ["GET", "POST", "PATCH", *deletes],
+            ),
+            (
+                f"/{resource_name}{item_route}",
+                f"{resource_name}_item",
+                ["GET", "PUT", *deletes],
+            ),
+            (f"/{resource_name}/batch-get", f"{resource_name}_batch", ["POST"]),
+        ]
+
+    def _register_lazy_routes(self) -> None:
+        """Register placeholder views on the blueprint for every model.
+
+        Flask refuses new URL rules once the app has served a request, so
+        the rules are all added up front; building a model then only swaps
+        its real views into `app.view_functions`.
+        """
+        for model_name, model in self.models.items():
+            for rule, endpoint, methods in self._model_routes(model_name, model):
+                self.blueprint.add_url_rule(
+                    rule,
+                    endpoint,
+                    partial(self._lazy_view, model_name),
+                    methods=methods,
+                )
+                # Let Flask-RESTX handle the errors of these endpoints
+                self.api.endpoints.add(endpoint)
+
+    def _lazy_view(self, model_name: str, **kwargs: Any) -> Any:
+        """Build a model on its first request, then serve the request.
+
+        Args:
+            model_name (str): Name of the requested model
+            **kwargs (Any): URL values of the request
+
+        Returns:
+            Any: Response of the real view
+        """
+        self._build_model(model_name)
+        return current_app.view_functions[request.endpoint](**kwargs)
+
+    def _api_model(self, model_name: str) -> Any:
+        """Get a model's Flask-RESTX model, generating it if needed.
+
+        Args:
+            model_name (str): Name of the model
+
+        Returns:
+            Any: Flask-RESTX model
+        """
+        if model_name not in self.api_models:
+            with self._build_lock:
+                if model_name not in self.api_models:
+                    self._generate_api_models([model_name])
+        return self.api_models[model_name]
+
+    def _build_model(self, model_name: str) -> None:
+        """Create a model's resources and install their views (lazy mode).
+
+        Safe to call from concurrent requests; the model is built once.
+
+        Args:
+            model_name (str): Name of the model
+        """
+        if model_name in self._built:
+            return
+        with self._build_lock:
+            if model_name in self._built:
+                return
+            self._api_model(model_name)
+            self._create_endpoints([model_name])
+
+            api = self.api
+            namespace = self.namespaces[model_name]
+            api.namespaces.append(namespace)
+            namespace.apis.append(api)
+            api.models.update(namespace.models)
+            api._configure_namespace_logger(self.app, namespace)
+            for route in namespace.resources:
+                # What Flask-RESTX does in `_register_view`, minus the URL rule
+                endpoint = route.kwargs["endpoint"]
+                route.resource.mediatypes = api.mediatypes_method()
+                route.resource.endpoint = endpoint
+                view = api.output(route.resource.as_view(endpoint, api))
+                for decorator in chain(namespace.decorators, api.decorators):
+                    view = decorator(view)
+                self.app.view_functions[api.endpoint(endpoint)] = view
+
+            # The spec and payload validation cache the schema of built models
+            api._schema = None
+            api._refresolver = None
+
+            self._built.add(model_name)
+
+    def _build_models(self) -> None:
+        """Build every model not built yet (lazy mode)."""
+        if not self.lazy:
+            return
+        for model_name in self.models:
+            self._build_model(model_name)
+
     def _map_sqlalchemy_type_to_restx_field(
         self, column_type: Any, column_nullable: bool
     ) -> fields.Raw:
@@ -239,13 +710,17 @@ class Api:
         # Create field with appropriate required setting
         return field_type(required=not column_nullable)
 
-    def _generate_api_models(self) -> None:
+    def _generate_api_models(self, model_names: Optional[Iterable[str]] = None) -> None:
         """Generate Flask-RESTX API models from SQLAlchemy models.
 
         For each discovered SQLAlchemy model, this method creates a corresponding
         Flask-RESTX model with appropriately mapped fields.
+
+        Args:
+            model_names (Optional[Iterable[str]]): Models to generate (default: all)
         """
-        for model_name, model in self.models.items():
+        for model_name in self.models if model_names is None else model_names:
+            model = self.models[model_name]
             # Create a namespace for the model
             namespace_name = inflection.pluralize(model_name.lower())
             namespace = Namespace(
@@ -256,11 +731,20 @@ class Api:
             mapper = inspect(model)
             model_fields = {}
 
-            # Add primary key fields
+            # Add primary key fields, generated by the database if autoincrement
+            # and optional in payloads when a default fills them in
             for column in mapper.primary_key:
-                model_fields[column.name] = fields.Integer(
-                    readonly=True, description=f"{column.name} identifier"
-                )
+                if column is column.table.autoincrement_column:
+                    field = fields.Integer(readonly=True)
+                else:
+                    generated = (
+                        column.default is not None or column.server_default is not None
+                    )
+                    field = self._map_sqlalchemy_type_to_restx_field(
+                        column.type, generated
+                    )
+                field.description = f"{column.name} identifier"
+                model_fields[column.name] = field
 
             # Add regular fields
             for column in mapper.columns:
@@ -285,196 +769,2200 @@ class Api:
             # Store namespace and API model
             self.namespaces[model_name] = namespace
             self.api_models[model_name] = api_model
+            self.query_builders[model_name] = QueryBuilder(
+                model, require_index=self.require_indexed_filters
+            )
+            if self.fast_serializers:
+                self.serializers[model_name] = compile_serializer(api_model)
+                self._row_serializers[model_name] = compile_serializer(
+                    api_model, mapping=True
+                )
 
-            # Add namespace to API
-            self.api.add_namespace(namespace)
+            # Add namespace to API, or once its resources exist when lazy
+            if not self.lazy:
+                self.api.add_namespace(namespace)
 
             if self.want_logs:
                 logger.info(f"Created API model for {model_name}")
 
-    def _create_endpoints(self) -> None:
-        """Create API endpoints for each model."""
-        for model_name, model in self.models.items():
-            # Get namespace and API model
-            namespace = self.namespaces[model_name]
-            api_model = self.api_models[model_name]
+    def _serializer(
+        self, api_model: Any, mapping: bool = False
+    ) -> Callable[[Any], Any]:
+        """Pick the function that serializes one object for the current request.
 
-            # Create resource name (pluralized)
-            resource_name = inflection.pluralize(model_name.lower())
+        Honours the Flask-RESTX field mask header the same way `marshal_with` does.
+        With `fast_serializers`, unmasked responses go through a serializer
+        compiled for the model, which produces the same output as `marshal`.
+        A model's full set of fields uses the serializer compiled at startup;
+        projections and expansions are compiled on first use.
 
-            # Store db reference for use in inner classes
-            db = self.db
-            disable_delete = self.disable_delete  # Pass the flag to the resources
+        Args:
+            api_model (Any): Flask-RESTX model (or list of one model)
+            mapping (bool): Objects are Core row mappings rather than ORM objects
 
-            # Create a factory function to ensure each class has its own bound model
-            def create_collection_resource(model, model_name):
-                """Create a collection resource for the model."""
+        Returns:
+            Callable[[Any], Any]: Function turning one object into a dict
+        """
+        if isinstance(api_model, list):
+            api_model = api_model[0]
+        mask_header = current_app.config.get("RESTX_MASK_HEADER", "X-Fields")
+        mask = request.headers.get(mask_header)
+
+        if self.fast_serializers and not mask:
+            name = getattr(api_model, "name", None)
+            if self.api_models.get(name) is api_model:
+                serializers = self._row_serializers if mapping else self.serializers
+                return serializers[name]
+            return compile_serializer(api_model, mapping=mapping)
+        return partial(marshal, fields=api_model, mask=mask)
+
+    def _marshal(self, data: Any, api_model: Any, mapping: bool = False) -> Any:
+        """Marshal query results with a Flask-RESTX model.
 
-                @namespace.route("/")
-                @namespace.response(HTTPStatus.NOT_FOUND, f"{model_name} not found")
-                @namespace.response(HTTPStatus.BAD_REQUEST, "Invalid request")
-                @namespace.response(
-                    HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error"
-                )  # noqa: E501
-                @namespace.doc(f"get_{resource_name}")
-                class Collection(Resource):
-                    """Collection resource for the model."""
+        Args:
+            data (Any): Object or list of objects to marshal
+            api_model (Any): Flask-RESTX model (or list of one model)
+            mapping (bool): Objects are Core row mappings rather than ORM objects
 
-                    # Store model references securely
-                    _model = model
-                    _model_name = model_name
-                    _want_logs = self.want_logs
-                    _disable_delete = disable_delete
+        Returns:
+            Any: JSON-serializable data
+        """
+        measured = g.get(METRICS_ATTRIBUTE) if self.metrics else None
+        started = time.perf_counter()
+        serialize = self._serializer(api_model, mapping=mapping)
+        if isinstance(data, (list, tuple)):
+            result = [serialize(item) for item in data]
+        else:
+            result = serialize(data)
+        if measured is not None:
+            measured.serialize_seconds += time.perf_counter() - started
+            measured.rows += len(data) if isinstance(data, (list, tuple)) else 1
+        return result
+
+    @staticmethod
+    def _supports_core_reads(model: Any) -> bool:
+        """Check whether a model's rows can be read straight from its table.
+
+        Inheritance hierarchies need the ORM to pick the right rows and columns,
+        so only plain single-table models qualify.
 
-                    @namespace.doc(f"list_{resource_name}")
-                    @namespace.marshal_list_with(api_model)
-                    def get(self):
-                        """Get all resources."""
-                        # Use direct query with the bound model
-                        return db.session.query(self._model).all()
+        Args:
+            model (Any): SQLAlchemy model class
 
-                    @namespace.doc(f"create_{inflection.singularize(resource_name)}")
-                    @namespace.expect(api_model)
-                    @namespace.marshal_with(api_model, code=HTTPStatus.CREATED)
-                    def post(self):
-                        """Create a new resource."""
-                        if self._want_logs:
-                            logger.info(f"Creating a new {self._model_name} instance")
+        Returns:
+            bool: True if a Core SELECT on the table returns the model's rows
+        """
+        mapper = inspect(model)
+        return (
+            mapper.inherits is None
+            and mapper.polymorphic_on is None
+            and isinstance(mapper.persist_selectable, Table)
+        )
 
-                        # Get request data
-                        data = namespace.payload
+    def _execute(self, statement: Any, core: bool = False, session: Any = None) -> Any:
+        """Execute a SELECT and return its rows.
 
-                        # Validate required fields
-                        for column in inspect(self._model).columns:
-                            if not column.nullable and not column.primary_key:
-                                if column.name not in data or data[column.name] is None:
-                                    namespace.abort(
-                                        400, f"Missing required field: {column.name}"
-                                    )
+        Args:
+            statement (Any): SELECT of the ORM entity, or of table columns
+            core (bool): Return `RowMapping` objects instead of ORM objects
+            session (Any): Session to read with (default: `db.session`)
 
-                        # Create new instance using the class's model
-                        instance = self._model()
+        Returns:
+            Any: Result iterating over row mappings or ORM objects
+        """
+        result = (session or self.db.session).execute(statement)
+        return result.mappings() if core else result.scalars()
 
-                        # Update instance with request data
-                        for key, value in data.items():
-                            if hasattr(instance, key):
-                                setattr(instance, key, value)
+    def _column_attributes(self, model: Any) -> Dict[str, Any]:
+        """Map the column names exposed by the API to the model's attributes.
 
-                        # Save to database
-                        db.session.add(instance)
-                        try:
-                            db.session.commit()
-                        except IntegrityError as e:
-                            db.session.rollback()
-                            logger.error(
-                                f"Integrity error creating {self._model_name}: {e}"
-                            )  # noqa: E501
-                            namespace.abort(
-                                HTTPStatus.BAD_REQUEST,
-                                f"Integrity error creating {self._model_name}",
-                            )
-                        except Exception as e:
-                            db.session.rollback()
-                            logger.error(f"Error creating {self._model_name}: {e}")
-                            namespace.abort(
-                                HTTPStatus.INTERNAL_SERVER_ERROR,
-                                f"Error creating {self._model_name}",
-                            )
+        Args:
+            model (Any): SQLAlchemy model class
 
-                        return instance, HTTPStatus.CREATED
+        Returns:
+            Dict[str, Any]: Column name to instrumented attribute
+        """
+        mapper = inspect(model)
+        return {
+            column.name: getattr(model, mapper.get_property_by_column(column).key)
+            for column in mapper.columns
+        }
 
-                return Collection
+    def _projection(
+        self, model: Any, api_model: Any, names: Optional[str]
+    ) -> Tuple[list, Any]:
+        """Resolve a `fields=` query parameter into a narrower SELECT and model.
 
-            # Similar factory for Item resource...
-            def create_item_resource(model, model_name):
-                @namespace.route("/<int:id>")
-                @namespace.param("id", f"The {model_name} identifier")
-                @namespace.response(HTTPStatus.NOT_FOUND, f"{model_name} not found")
-                @namespace.response(HTTPStatus.BAD_REQUEST, "Invalid request")
-                @namespace.response(
-                    HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error"
-                )  # noqa: E501
-                class Item(Resource):
-                    """Resource for a specific item."""
+        Columns the client did not ask for are left out of the SELECT, so large
+        text, binary and JSON columns are never read or sent unless requested.
 
-                    # Store model references securely
-                    _model = model
-                    _model_name = model_name
-                    _want_logs = self.want_logs
-                    _disable_delete = disable_delete
+        Args:
+            model (Any): SQLAlchemy model class
+            api_model (Any): Flask-RESTX model for the SQLAlchemy model
+            names (Optional[str]): Comma-separated field names, if any
 
-                    @namespace.doc(f"get_{inflection.singularize(resource_name)}")
-                    @namespace.marshal_with(api_model)
-                    def get(self, id):
-                        """Get a specific resource."""
-                        instance = db.session.query(self._model).get(id)
-                        if not instance:
-                            namespace.abort(
-                                HTTPStatus.NOT_FOUND,
-                                f"{self._model_name} with id {id} not found",  # noqa: E501
-                            )
-                        return instance
+        Returns:
+            Tuple[list, Any]: ORM loader options and the fields to marshal with
+        """
+        if not names:
+            return [], api_model
 
-                    @namespace.doc(f"update_{inflection.singularize(resource_name)}")
-                    @namespace.expect(api_model)
-                    @namespace.marshal_with(api_model)
-                    def put(self, id):
-                        """Update a specific resource."""
-                        if self._want_logs:
-                            logger.debug(f"Updating {self._model_name} with id {id}")
+        requested = {name.strip() for name in names.split(",") if name.strip()}
+        unknown = sorted(requested.difference(api_model))
+        if unknown:
+            raise QueryError(f"Unknown field(s): {', '.join(unknown)}")
 
-                        instance = db.session.query(self._model).get(id)
+        # The primary key is always loaded, it identifies the row
+        attributes = self._column_attributes(model)
+        options = [load_only(*[attributes[name] for name in requested])]
+        fields_ = {name: f for name, f in api_model.items() if name in requested}
+        return options, fields_
 
-                        if not instance:
-                            logger.warning(f"{self._model_name} with id {id} not found")
-                            namespace.abort(
-                                HTTPStatus.NOT_FOUND,
-                                f"{self._model_name} with id {id} not found",
-                            )
+    def _expansion(
+        self, model: Any, api_model: Any, names: Optional[str]
+    ) -> Tuple[list, Any]:
+        """Resolve an `expand=` query parameter into eager loads and fields.
 
-                        # Get request data
-                        data = namespace.payload
+        Many-to-one relationships are joined into the same SELECT, and
+        collections are loaded with one extra `SELECT ... IN` per level, so
+        the number of queries does not grow with the number of rows.
 
-                        # Update instance with request data
-                        for key, value in data.items():
-                            if hasattr(instance, key):
-                                setattr(instance, key, value)
+        Args:
+            model (Any): SQLAlchemy model class
+            api_model (Any): Fields the response is marshalled with so far
+            names (Optional[str]): Comma-separated relationship paths such as
+                `user` or `user.items`, if any
 
-                        # Save to database
-                        db.session.commit()
+        Returns:
+            Tuple[list, Any]: ORM loader options and the fields to marshal with
+        """
+        if not names:
+            return [], api_model
+
+        options = []
+        tree = {}  # Relationship key -> subtree
+        for path in sorted({name.strip() for name in names.split(",")}):
+            if not path:
+                continue
+            segments = path.split(".")
+            if len(segments) > self.max_expand_depth:
+                raise QueryError(
+                    f"Cannot expand '{path}' deeper than {self.max_expand_depth}"
+                )
 
-                        return instance
+            current, loader, node = model, None, tree
+            for segment in segments:
+                relationship = inspect(current).relationships.get(segment)
+                if (
+                    relationship is None
+                    or relationship.mapper.class_ not in self._model_names
+                ):
+                    raise QueryError(f"Cannot expand unknown relationship '{path}'")
+
+                attribute = getattr(current, segment)
+                if loader is None:
+                    loader = (selectinload if relationship.uselist else joinedload)(
+                        attribute
+                    )
+                elif relationship.uselist:
+                    loader = loader.selectinload(attribute)
+                else:
+                    loader = loader.joinedload(attribute)
+                current = relationship.mapper.class_
+                node = node.setdefault(segment, {})
+            options.append(loader)
+
+        expanded = self._expanded_fields(model, self._freeze(tree))
+        return options, {**api_model, **expanded}
+
+    def _expanded_models(self, model: Any, names: Optional[str]) -> List[str]:
+        """Name the models an `expand=` parameter embeds in a response.
+
+        Invalid paths are skipped; `_expansion` rejects them.
 
-                    # Only include delete method if deletion is not disabled
-                    if not _disable_delete:
+        Args:
+            model (Any): SQLAlchemy model class
+            names (Optional[str]): Comma-separated relationship paths, if any
 
-                        @namespace.doc(
-                            f"delete_{inflection.singularize(resource_name)}"
-                        )
-                        @namespace.response(
-                            HTTPStatus.NO_CONTENT, f"{model_name} deleted"
-                        )
-                        def delete(self, id):
-                            """Delete a specific resource."""
-                            # Use session query instead of model.query
-                            instance = db.session.query(self._model).get(id)
-                            if not instance:
-                                namespace.abort(
-                                    HTTPStatus.NOT_FOUND,
-                                    f"{self._model_name} with id {id} not found",  # noqa: E501
-                                )
+        Returns:
+            List[str]: Model names, sorted
+        """
+        found = set()
+        for path in (names or "").split(","):
+            current = model
+            for segment in filter(None, path.strip().split(".")):
+                relationship = inspect(current).relationships.get(segment)
+                if relationship is None:
+                    break
+                current = relationship.mapper.class_
+                if current in self._model_names:
+                    found.add(self._model_names[current])
+        return sorted(found)
+
+    @staticmethod
+    def _freeze(tree: dict) -> tuple:
+        """Turn an expansion tree into a hashable, ordered key."""
+        return tuple(
+            (key, Api._freeze(subtree)) for key, subtree in sorted(tree.items())
+        )
 
-                            # Delete from database
-                            db.session.delete(instance)
-                            db.session.commit()
+    def _expanded_fields(self, model: Any, tree: tuple) -> dict:
+        """Build the nested fields that embed the relationships of `tree`.
 
-                            return "", HTTPStatus.NO_CONTENT
+        The fields are built once per model and tree, so compiled serializers
+        keyed on them stay cached.
 
-                return Item
+        Args:
+            model (Any): SQLAlchemy model class
+            tree (tuple): Frozen expansion tree from `_freeze`
+
+        Returns:
+            dict: Relationship key -> nested field
+        """
+        key = (self._model_names[model], tree)
+        if key not in self.expansions:
+            relationships = inspect(model).relationships
+            expanded = {}
+            for name, subtree in tree:
+                target = relationships[name].mapper.class_
+                nested = {
+                    **self._api_model(self._model_names[target]),
+                    **self._expanded_fields(target, subtree),
+                }
+                if relationships[name].uselist:
+                    expanded[name] = fields.List(fields.Nested(nested))
+                else:
+                    expanded[name] = fields.Nested(nested, allow_null=True)
+            self.expansions[key] = expanded
+        return self.expansions[key]
+
+    @staticmethod
+    def _check_count_mode(mode: str) -> None:
+        """Reject a configured count mode that does not exist.
+
+        Args:
+            mode (str): Configured count mode
+
+        Raises:
+            ValueError: If `mode` is not one of `COUNT_MODES`
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError(
+                f"Unknown count mode {mode!r}, expected one of {', '.join(COUNT_MODES)}"
+            )
+
+    def _configured_count_mode(self, model_name: str) -> str:
+        """Get the count mode configured for a model."""
+        return self.count_modes.get(
+            model_name, self.registry.option(model_name, "count_mode", self.count_mode)
+        )
+
+    def _count_mode(self, model_name: str, requested: Optional[str]) -> str:
+        """Resolve the count mode of a listing.
+
+        Clients may ask for a cheaper mode than the model's, never a costlier
+        one, so `?count=exact` cannot force a full scan of a huge table.
+
+        Args:
+            model_name (str): Name of the model
+            requested (Optional[str]): `count` query parameter, if any
+
+        Returns:
+            str: "exact", "estimated" or "none"
+        """
+        configured = self._configured_count_mode(model_name)
+        if requested is None:
+            return configured
+        return min(requested, configured, key=COUNT_MODES.index)
+
+    def _count(
+        self,
+        model: Any,
+        statement: Any,
+        mode: str,
+        filtered: bool,
+        session: Any = None,
+    ) -> Optional[int]:
+        """Count the rows of a listing, however the mode allows.
+
+        An estimate is never replaced by an exact count, which would scan the
+        very tables "estimated" is meant for whenever statistics are missing.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            statement (Any): Filtered SELECT of the listing
+            mode (str): "exact", "estimated" or "none"
+            filtered (bool): Whether the SELECT has a WHERE clause
+            session (Any): Session to count with (default: `db.session`)
+
+        Returns:
+            Optional[int]: Total, or None with mode "none" and when the
+                database has no statistics to estimate from
+        """
+        session = session or self.db.session
+        if mode == "none":
+            return None
+        if mode == "estimated":
+            table = inspect(model).local_table
+            return estimated_count(session, table, statement, filtered)
+        return exact_count(session, statement)
+
+    def _remember_write(self, response: Response) -> Response:
+        """Pin a client to the primary for a while after its writes.
+
+        The cookie holds the time until which the client's reads skip the
+        replicas, so it sees its own write despite replication lag.
+
+        Args:
+            response (Response): Response of any request to the API
+
+        Returns:
+            Response: The response, with the cookie after a successful write
+        """
+        if request.method in ("POST", "PUT", "PATCH", "DELETE") and (
+            response.status_code < HTTPStatus.BAD_REQUEST
+        ):
+            until = time.time() + self.read_your_writes
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                str(int(until) + 1),
+                max_age=self.read_your_writes,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def _pinned_to_primary(self) -> bool:
+        """Tell whether the client wrote recently and must read the primary."""
+        pinned = request.cookies.get(READ_PRIMARY_COOKIE, "")
+        return pinned.isdigit() and int(pinned) > time.time()
+
+    def _pick_replica(self) -> Optional[Tuple[int, Any]]:
+        """Choose the replica engine a GET reads from.
+
+        Returns:
+            Optional[Tuple[int, Any]]: Replica index and engine, or None when
+                the read must go to the primary
+        """
+        if not self.read_replicas or self._pinned_to_primary():
+            return None
+
+        now = time.monotonic()
+        healthy = [
+            index
+            for index in range(len(self.read_replicas))
+            if self._replicas_down.get(index, 0) <= now
+        ]
+        if not healthy:
+            return None
+        if self.replica_policy == "random":
+            index = random.choice(healthy)
+        else:
+            index = healthy[next(self._replica_turns) % len(healthy)]
+
+        replica = self.read_replicas[index]
+        engine = self.db.engines[replica] if isinstance(replica, str) else replica
+        return index, engine
+
+    def _routed_read(self, read: Callable, *args: Any) -> Any:
+        """Run a read on a replica if one is usable, or on `db.session`.
+
+        A replica that cannot be reached is left out for
+        `replica_retry_after` seconds, and the read is retried on the primary.
+
+        Args:
+            read (Callable): Function taking a session, then `args`
+            *args (Any): Further arguments of `read`
+
+        Returns:
+            Any: Return value of `read`
+        """
+        replica = self._pick_replica()
+        if replica is None:
+            return read(self.db.session, *args)
+
+        index, engine = replica
+        try:
+            with Session(bind=engine) as session:
+                result = read(session, *args)
+            g._api_replica_read = True
+            return result
+        except OperationalError as e:
+            logger.warning(f"Read replica {index} failed, using the primary: {e}")
+            self._replicas_down[index] = time.monotonic() + self.replica_retry_after
+            return read(self.db.session, *args)
+
+    def _instrument_engines(self) -> None:
+        """Count the statements of every engine the API reads or writes."""
+        engines = list(self.db.engines.values())
+        engines.extend(
+            replica for replica in self.read_replicas if not isinstance(replica, str)
+        )
+        for engine in engines:
+            instrument(engine)
+
+    def _start_query_stats(self) -> None:
+        """Start counting the statements of a request to the API."""
+        setattr(g, STATS_ATTRIBUTE, QueryStats())
+
+    def _check_query_budget(self, response: Response) -> Response:
+        """Report the statements a request ran and enforce its budget.
+
+        Statements run while streaming the body happen after this check and
+        are not counted.
+
+        Args:
+            response (Response): Response of any request to the API
+
+        Returns:
+            Response: The response, with `X-DB-Queries` and `X-DB-Time`
+                (milliseconds) headers
+
+        Raises:
+            QueryBudgetError: If the request exceeded its budget and
+                `query_budget_action` is "raise"
+        """
+        stats = g.get(STATS_ATTRIBUTE)
+        if stats is None:
+            return response
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["X-DB-Time"] = f"{stats.seconds * 1000:.3f}"
+
+        endpoint = (request.endpoint or "").rpartition(".")[2]
+        for statement, runs in stats.repeated(self.n_plus_one_threshold):
+            logger.warning(f"Likely N+1 queries in {endpoint}: {runs} x {statement}")
+
+        if isinstance(self.query_budget, dict):
+            budget = self.query_budget.get(endpoint)
+        else:
+            budget = self.query_budget
+        if budget is not None and stats.count > budget:
+            message = (
+                f"{request.method} {request.path} ran {stats.count} SQL "
+                f"statements, over the budget of {budget} for {endpoint}"
+            )
+            if self.query_budget_action == "raise":
+                raise QueryBudgetError(message)
+            logger.warning(message)
+        return response
+
+    def _start_request_metrics(self) -> None:
+        """Start measuring a request to the API."""
+        setattr(g, METRICS_ATTRIBUTE, RequestMetrics())
+
+    def _record_metrics(self, response: Response) -> Response:
+        """Record the metrics of a request to a generated endpoint.
+
+        Rows and time spent serializing streamed exports are not measured.
+
+        Args:
+            response (Response): Response of any request to the API
+
+        Returns:
+            Response: The response, unchanged
+        """
+        measured = g.get(METRICS_ATTRIBUTE)
+        endpoint = (request.endpoint or "").rpartition(".")[2]
+        model_name = self._resources.get(endpoint.rpartition("_")[0])
+        if measured is None or model_name is None:
+            return response
+
+        labels = (("model", model_name), ("method", request.method))
+        metrics = self._metrics
+        status = str(response.status_code)
+        metrics.inc("api_requests_total", (*labels, ("status", status)))
+
+        stats = g.get(STATS_ATTRIBUTE)
+        for phase, seconds in (
+            ("total", time.perf_counter() - measured.started),
+            ("db", stats.seconds if stats is not None else 0.0),
+            ("serialize", measured.serialize_seconds),
+        ):
+            metrics.observe(
+                "api_request_duration_seconds", (*labels, ("phase", phase)), seconds
+            )
+        metrics.inc("api_rows_returned_total", labels, measured.rows)
+        if not response.is_streamed and response.content_length is not None:
+            metrics.inc("api_response_bytes_total", labels, response.content_length)
+        return response
+
+    def _metrics_view(self) -> Response:
+        """Serve the metrics in Prometheus text format."""
+        return Response(self._metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+    def _page_limit(self, limit: Optional[int]) -> int:
+        """Resolve the page size requested by the client.
+
+        Args:
+            limit (Optional[int]): `limit` query parameter, if any
+
+        Returns:
+            int: Page size, capped at `max_page_size`
+        """
+        if limit is None:
+            return self.page_size
+        if limit < 1:
+            raise QueryError("limit must be a positive integer")
+        return min(limit, self.max_page_size)
+
+    def _keyset_page(
+        self,
+        query: QueryBuilder,
+        statement: Any,
+        order_by: List[Tuple[Any, bool]],
+        cursor: Optional[str],
+        limit: Optional[int],
+        core: bool = False,
+        session: Any = None,
+    ) -> dict:
+        """Fetch one page of a listing with keyset pagination.
+
+        The page is selected with `WHERE (keys) > (:last) ORDER BY keys LIMIT n`,
+        so the database seeks through the index on the ordering columns instead
+        of counting past every earlier row the way OFFSET does.
+
+        Args:
+            query (QueryBuilder): Query builder of the model
+            statement (Any): Filtered SELECT statement to page through
+            order_by (List[Tuple[Any, bool]]): Ordering keys, ending with the
+                primary key
+            cursor (Optional[str]): Cursor of the previous page, if any
+            limit (Optional[int]): Requested page size
+            core (bool): Read row mappings with Core instead of ORM objects
+            session (Any): Session to read with (default: `db.session`)
+
+        Returns:
+            dict: `items` on this page and the `next` cursor (None when done)
+        """
+        limit = self._page_limit(limit)
+
+        if cursor:
+            values = query.cursor_values(order_by, cursor)
+            statement = statement.where(keyset_predicate(order_by, values))
+
+        # Fetch one extra row to learn whether another page follows
+        statement = statement.order_by(*order_clauses(order_by))
+        rows = self._execute(statement.limit(limit + 1), core, session).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(
+                query.row_values(rows[-1], order_by, mapping=core)
+            )
+
+        return {"items": rows, "next": next_cursor}
+
+    @staticmethod
+    def _missing_field(model: Any, data: dict) -> Optional[str]:
+        """Find a required field missing from a create payload.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            data (dict): Request payload for one row
+
+        Returns:
+            Optional[str]: Name of the first missing required column, if any
+        """
+        for column in inspect(model).columns:
+            if column.primary_key:
+                # Keys the database or a default fills in are optional
+                required = (
+                    column is not column.table.autoincrement_column
+                    and column.default is None
+                    and column.server_default is None
+                )
+            else:
+                required = not column.nullable
+            if required and (column.name not in data or data[column.name] is None):
+                return column.name
+        return None
+
+    def _bulk_create(self, model: Any, rows: list) -> list:
+        """Insert a JSON array of new rows in a single transaction.
+
+        Every row is checked against the same required-field rules as a single
+        create before anything is written. Rows are then inserted in batches of
+        `bulk_batch_size` with executemany, using RETURNING where the dialect
+        supports it, and committed once.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            rows (list): Request payload, one dict per new row
+
+        Returns:
+            list: Created rows, in request order
+
+        Raises:
+            BulkWriteError: If any row is invalid or rejected by the database
+        """
+        model_name = self._model_names[model]
+        errors = []
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                errors.append({"index": index, "message": "Expected a JSON object"})
+                continue
+            missing = self._missing_field(model, row)
+            if missing:
+                errors.append(
+                    {"index": index, "message": f"Missing required field: {missing}"}
+                )
+        if errors:
+            raise BulkWriteError(f"Invalid {model_name} rows", errors)
+
+        # Keep only keys that name a column, like single creates ignore the rest
+        columns = self.query_builders[model_name].columns
+        values = [
+            {key: value for key, value in row.items() if key in columns} for row in rows
+        ]
+
+        created = []
+        try:
+            for start in range(0, len(values), self.bulk_batch_size):
+                batch = values[start : start + self.bulk_batch_size]
+                created.extend(self._insert_batch(model, batch))
+            self.db.session.commit()
+        except (IntegrityError, DataError) as e:
+            self.db.session.rollback()
+            logger.error(f"Database error creating {model_name} rows: {e}")
+            raise BulkWriteError(
+                f"{self._write_error(e)} creating {model_name}",
+                self._diagnose_bulk_create(model, values),
+            )
+        except Exception:
+            self.db.session.rollback()
+            raise
+
+        return created
+
+    def _insert_batch(self, model: Any, batch: List[dict]) -> list:
+        """Insert one batch of rows and return them as created.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            batch (List[dict]): Column values of each new row
+
+        Returns:
+            list: Created rows (row mappings or ORM objects), in batch order
+        """
+        mapper = inspect(model)
+        session = self.db.session
+        dialect = session.get_bind(mapper=mapper).dialect
+
+        if not dialect.insert_executemany_returning_sort_by_parameter_order:
+            # Without ordered RETURNING, let the ORM fetch the generated keys
+            attributes = self.query_builders[self._model_names[model]].attributes
+            instances = [
+                model(**{attributes[key].key: value for key, value in row.items()})
+                for row in batch
+            ]
+            session.add_all(instances)
+            session.flush()
+            return instances
+
+        # executemany needs the same keys in every row, so insert rows with
+        # the same keys together and put the results back in request order
+        groups = {}
+        for position, row in enumerate(batch):
+            groups.setdefault(tuple(sorted(row)), []).append((position, row))
+
+        table = mapper.local_table
+        created = [None] * len(batch)
+        for members in groups.values():
+            statement = insert(table).returning(
+                *table.columns, sort_by_parameter_order=True
+            )
+            result = session.execute(statement, [row for _, row in members])
+            for (position, _), row in zip(members, result.mappings().all()):
+                created[position] = row
+        return created
+
+    def _diagnose_bulk_create(self, model: Any, values: List[dict]) -> List[dict]:
+        """Find the rows of a failed bulk insert that the database rejects.
+
+        Each row is retried in its own savepoint, and everything is rolled
+        back afterwards. This only runs after a batch has already failed.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            values (List[dict]): Column values of each new row
+
+        Returns:
+            List[dict]: One {"index", "message"} entry per rejected row
+        """
+        table = inspect(model).local_table
+        session = self.db.session
+        errors = []
+        try:
+            for index, row in enumerate(values):
+                savepoint = session.begin_nested()
+                try:
+                    session.execute(insert(table).values(**row))
+                    savepoint.commit()
+                except (IntegrityError, DataError) as e:
+                    savepoint.rollback()
+                    logger.error(f"Database error in row {index}: {e}")
+                    errors.append({"index": index, "message": self._write_error(e)})
+        finally:
+            session.rollback()
+        return errors
+
+    @staticmethod
+    def _write_error(error: Exception) -> str:
+        """Describe a database error that rejected written values.
+
+        Args:
+            error (Exception): `IntegrityError` or `DataError`
+
+        Returns:
+            str: "Integrity error" or "Invalid data"
+        """
+        return (
+            "Integrity error" if isinstance(error, IntegrityError) else "Invalid data"
+        )
+
+    def _primary_key_in(self, model: Any, ids: list) -> Any:
+        """Build a `WHERE pk IN (...)` clause for a list of identifiers.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            ids (list): Primary key values, as lists for composite keys
+
+        Returns:
+            Any: Clause matching the rows with those identifiers
+        """
+        query = self.query_builders[self._model_names[model]]
+        return query.identities_clause([query.coerce_identity(id) for id in ids])
+
+    def _batch_get(
+        self,
+        model: Any,
+        payload: Any,
+        options: list,
+        output_fields: Any,
+        core: bool = False,
+    ) -> Tuple[list, list]:
+        """Fetch the rows with the requested identifiers in few queries.
+
+        Identifiers are resolved with one `WHERE pk IN (...)` query per
+        `batch_get_chunk_size` of them.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            payload (Any): Request payload with an `ids` list (of lists for
+                composite keys)
+            options (list): ORM loader options
+            output_fields (Any): Fields the rows will be marshalled with
+            core (bool): Read plain rows instead of ORM objects
+
+        Returns:
+            Tuple[list, list]: Rows in request order, and the missing
+                identifiers as the client sent them
+
+        Raises:
+            QueryError: If the payload has no valid `ids` list
+        """
+        ids = payload.get("ids") if isinstance(payload, dict) else None
+        if not isinstance(ids, list) or not ids:
+            raise QueryError("ids must be a non-empty list")
+
+        query = self.query_builders[self._model_names[model]]
+        requested = [query.coerce_identity(id) for id in ids]
+        # Coerced keys (UUIDs, tuples) are not JSON, so echo what was sent
+        sent = {}
+        for id, raw in zip(requested, ids):
+            sent.setdefault(id, raw)
+        unique = list(sent)
+
+        if core:
+            columns = query.select_columns(output_fields, query.primary_key)
+            statement = select(*columns)
+        else:
+            statement = select(model).options(*options)
+
+        found = {}
+        size = self.batch_get_chunk_size
+        for start in range(0, len(unique), size):
+            chunk = statement.where(
+                query.identities_clause(unique[start : start + size])
+            )
+            for row in self._execute(chunk, core):
+                found[query.row_identity(row, core)] = row
+
+        rows = [found[id] for id in requested if id in found]
+        missing = [sent[id] for id in unique if id not in found]
+        return rows, missing
+
+    def _bulk_criteria(self, model: Any, payload: Any) -> list:
+        """Compile the `ids` and `filter` of a bulk request into WHERE clauses.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            payload (Any): Request payload
+
+        Returns:
+            list: Clauses to AND together
+
+        Raises:
+            QueryError: If the payload selects no rows or is malformed
+        """
+        if not isinstance(payload, dict):
+            raise QueryError("Expected a JSON object")
+
+        clauses = []
+        ids = payload.get("ids")
+        if ids is not None:
+            if not isinstance(ids, list) or not ids:
+                raise QueryError("ids must be a non-empty list")
+            clauses.append(self._primary_key_in(model, ids))
+
+        filter_ = payload.get("filter")
+        if filter_ is not None:
+            if not isinstance(filter_, dict) or not filter_:
+                raise QueryError("filter must be a non-empty object")
+            query = self.query_builders[self._model_names[model]]
+            clauses.extend(query.filters(filter_.items(), strict=True))
+
+        # Never let a missing selector turn into a whole-table write
+        if not clauses:
+            raise QueryError("Select rows with ids and/or filter")
+        return clauses
+
+    def _bulk_update(self, model: Any, payload: Any) -> int:
+        """Update the selected rows with one `UPDATE ... WHERE` statement.
+
+        The mapper's `version_id_col` moves forward in the same statement, so
+        ETags and `If-Match` versions read before the update go stale.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            payload (Any): Request payload with `ids`/`filter` and `values`
+
+        Returns:
+            int: Number of rows updated
+
+        Raises:
+            QueryError: If the payload is invalid, or the version cannot be
+                moved forward in SQL
+        """
+        clauses = self._bulk_criteria(model, payload)
+        values = payload.get("values")
+        if not isinstance(values, dict) or not values:
+            raise QueryError("values must be a non-empty object")
+
+        query = self.query_builders[self._model_names[model]]
+        columns = query.columns
+        unknown = sorted(
+            key for key in values if key not in columns or columns[key].primary_key
+        )
+        if unknown:
+            raise QueryError(f"Cannot update field(s): {', '.join(unknown)}")
+
+        mapper = inspect(model)
+        set_values = {
+            columns[key]: query.coerce_payload(key, value)
+            for key, value in values.items()
+        }
+        version = mapper.version_id_col
+        if version is not None and version not in set_values:
+            next_version = self._next_version(mapper, version, None)
+            if next_version is not None:
+                set_values[version] = next_version
+            elif mapper.version_id_generator is not False and (
+                version.onupdate is None and version.server_onupdate is None
+            ):
+                # A custom generator needs each row's current version
+                raise QueryError(
+                    f"Cannot bulk update {self._model_names[model]}: its version column "
+                    "has a custom generator"
+                )
+
+        statement = update(mapper.local_table).where(*clauses).values(set_values)
+        return self._execute_write(statement)
+
+    def _bulk_delete(self, model: Any, payload: Any) -> int:
+        """Delete the selected rows with one `DELETE ... WHERE` statement.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            payload (Any): Request payload with `ids` and/or `filter`
+
+        Returns:
+            int: Number of rows deleted
+        """
+        clauses = self._bulk_criteria(model, payload)
+        table = inspect(model).local_table
+        return self._execute_write(delete(table).where(*clauses))
+
+    def _execute_write(self, statement: Any) -> int:
+        """Execute and commit a Core write statement.
+
+        Args:
+            statement (Any): UPDATE or DELETE statement
+
+        Returns:
+            int: Number of rows matched
+        """
+        try:
+            result = self.db.session.execute(statement)
+            self.db.session.commit()
+        except Exception:
+            self.db.session.rollback()
+            raise
+        return result.rowcount
+
+    @staticmethod
+    def _item_route(model: Any) -> Tuple[str, List[str]]:
+        """Build the URL rule of a model's item resource from its primary key.
+
+        A single-column key is the `id` segment, a composite key gets one
+        segment per column. Each segment's converter follows the column type.
+
+        Args:
+            model (Any): SQLAlchemy model class
+
+        Returns:
+            Tuple[str, List[str]]: URL rule, and its variable names in key order
+        """
+        key_columns = list(inspect(model).primary_key)
+        if len(key_columns) == 1:
+            names = ["id"]
+        else:
+            names = [column.name for column in key_columns]
+
+        segments = []
+        for name, column in zip(names, key_columns):
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                python_type = str
+            converter = ROUTE_CONVERTERS.get(python_type, "string")
+            segments.append(f"<{converter}:{name}>")
+        return "/" + "/".join(segments), names
+
+    def _item_identity(self, resource: Any, kwargs: dict) -> Any:
+        """Turn the URL variables of an item route into a `Session.get` identity.
+
+        Args:
+            resource (Any): Item resource
+            kwargs (dict): URL variables
+
+        Returns:
+            Any: Key value, tuple for a composite key, or None outside an item
+        """
+        if not kwargs:
+            return None
+        query = self.query_builders[resource._model_name]
+        values = [kwargs[name] for name in resource._key_names]
+        try:
+            return query.coerce_identity(values[0] if len(values) == 1 else values)
+        except QueryError:
+            abort(HTTPStatus.NOT_FOUND)
+
+    def _cached(self, view: Callable) -> Callable:
+        """Serve a GET view from the response cache, if one is configured.
+
+        Only successful responses are cached, and streams never are. The key
+        covers the query string and the headers that change the body.
+
+        With read replicas, clients pinned to the primary after a write skip
+        the cache, and responses read from a replica are not stored for
+        `read_your_writes` seconds after a write to any model they show, as
+        the replica may not have that write yet.
+
+        Args:
+            view (Callable): Resource method taking an optional `id`
+
+        Returns:
+            Callable: Wrapped method
+        """
+        if self.response_cache is None:
+            return view
+
+        @wraps(view)
+        def wrapper(resource, *args, **kwargs):
+            if self.read_replicas and self._pinned_to_primary():
+                return view(resource, *args, **kwargs)
+
+            variant = "|".join(
+                (
+                    request.query_string.decode("latin-1"),
+                    request.headers.get("X-Fields", ""),
+                    request.headers.get("Accept", ""),
+                )
+            )
+            related = self._expanded_models(resource._model, request.args.get("expand"))
+            key = self.response_cache.key(
+                resource._model_name,
+                variant,
+                self._item_identity(resource, kwargs),
+                related,
+            )
+
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                mimetype, headers, body = cached
+                response = Response(body, mimetype=mimetype, headers=headers)
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            result = view(resource, *args, **kwargs)
+            if isinstance(result, Response):
+                return result
+
+            response = self.api.make_response(*unpack(result))
+            lagging = g.get("_api_replica_read") and self.response_cache.held(
+                resource._model_name, *related
+            )
+            if response.status_code == HTTPStatus.OK and not lagging:
+                headers = [
+                    (name, value)
+                    for name, value in response.headers.items()
+                    if name not in ("Content-Type", "Content-Length")
+                ]
+                self.response_cache.set(
+                    key, response.mimetype, response.get_data(), headers
+                )
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    def _version_column(self, model_name: str, model: Any) -> Optional[str]:
+        """Find the column whose value changes whenever a row changes.
+
+        That is the mapper's `version_id_col`, or else the column named by the
+        model's `version_column` option, which must be an integer or datetime
+        column with an `onupdate` so that every write moves it forward.
+
+        Args:
+            model_name (str): Name of the model
+            model (Any): SQLAlchemy model class
+
+        Returns:
+            Optional[str]: Attribute key of the version column, or None
+
+        Raises:
+            ModelMappingError: If the `version_column` option names no such
+                column
+        """
+        mapper = inspect(model)
+        if mapper.version_id_col is not None:
+            return mapper.get_property_by_column(mapper.version_id_col).key
+
+        key = self.registry.option(model_name, "version_column")
+        if key is None:
+            return None
+        column = mapper.columns.get(key)
+        try:
+            python_type = column.type.python_type if column is not None else None
+        except NotImplementedError:
+            python_type = None
+        if python_type not in (int, datetime.datetime) or (
+            column.onupdate is None and column.server_onupdate is None
+        ):
+            raise ModelMappingError(
+                f"version_column {key!r} of {model_name} must be an integer or "
+                "datetime column with an onupdate"
+            )
+        return key
+
+    @staticmethod
+    def _version_validators(
+        resource: Any, id: Any, version: Any
+    ) -> Tuple[str, Optional[datetime.datetime]]:
+        """Derive the ETag and Last-Modified of an item from its row version.
+
+        The ETag starts with the encoded version, so `If-Match` can be turned
+        back into a version check, and ends with a digest of everything that
+        selects the representation, so `?fields=` projections and masks get
+        their own tags.
+
+        Args:
+            resource (Any): Item resource class
+            id (Any): Item identifier
+            version (Any): Value of the version column
+
+        Returns:
+            Tuple[str, Optional[datetime.datetime]]: ETag, and the version when
+                it is a timestamp
+        """
+        parts = (
+            resource._model_name,
+            str(id),
+            request.query_string.decode("latin-1"),
+            request.headers.get("X-Fields", ""),
+            request.headers.get("Accept", ""),
+        )
+        digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+        etag = f"{encode_cursor([version])}.{digest[:16]}"
+        if isinstance(version, datetime.datetime):
+            return etag, version.replace(microsecond=0)
+        return etag, None
+
+    def _conditional(self, view: Callable) -> Callable:
+        """Add validators to a GET view and answer conditional requests.
+
+        Items of models with a version column are checked against
+        `If-None-Match` / `If-Modified-Since` with a primary-key lookup of the
+        version alone, before the row is fetched or serialized. Other responses
+        get a strong ETag hashed from the serialized body.
+
+        The version is read before the row, so a write committed in between
+        can only pair a newer body with an older tag, which costs the client
+        one extra full response and never yields a stale 304.
+
+        Reads that may go to a lagging replica skip that early check, and tag
+        the body with the version of the row it was read from instead.
+
+        Args:
+            view (Callable): Resource method taking an optional `id`
+
+        Returns:
+            Callable: Wrapped method
+        """
+        if not self.etags:
+            return view
+
+        def row_version(resource: Any, id: Any) -> Any:
+            query = self.query_builders[resource._model_name]
+            version = getattr(resource._model, resource._version)
+            statement = select(version).where(query.identity_clause(id))
+            return self.db.session.execute(statement).scalar_one_or_none()
+
+        def validate(response: Response, etag: str, last_modified: Any) -> Response:
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            return response.make_conditional(request)
+
+        @wraps(view)
+        def wrapper(resource, *args, **kwargs):
+            id = self._item_identity(resource, kwargs)
+            validators = None
+            versioned = id is not None and resource._version is not None
+            primary = not self.read_replicas or self._pinned_to_primary()
+            if versioned and primary:
+                version = row_version(resource, id)
+                if version is not None:
+                    validators = self._version_validators(resource, id, version)
+                    response = validate(Response(), *validators)
+                    if response.status_code == HTTPStatus.NOT_MODIFIED:
+                        return response
+
+            result = view(resource, *args, **kwargs)
+            if isinstance(result, Response):
+                response = result
+            else:
+                response = self.api.make_response(*unpack(result))
+            if response.status_code != HTTPStatus.OK or response.is_streamed:
+                return response
+
+            if validators is None and versioned and not primary:
+                version = g.get("_api_row_version")
+                if version is not None:
+                    validators = self._version_validators(resource, id, version)
+            if validators is not None:
+                return validate(response, *validators)
+            response.add_etag()
+            return response.make_conditional(request)
+
+        return wrapper
+
+    def _expected_version(self, model: Any, version_key: str, data: dict) -> Any:
+        """Find the row version a client's update is based on.
+
+        Taken from an `If-Match` ETag, or else, for the mapper's
+        `version_id_col` only, from the version field of the payload.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            version_key (str): Attribute key of the version column
+            data (dict): Request payload
+
+        Returns:
+            Any: Expected version, or None when the client did not state one
+
+        Raises:
+            VersionConflictError: If `If-Match` names no version of this row
+        """
+        query = self.query_builders[self._model_names[model]]
+        name = query.column_names[version_key]
+
+        if request.if_match and not request.if_match.star_tag:
+            for tag in request.if_match.as_set():
+                encoded, _, _ = tag.partition(".")
+                try:
+                    return query.coerce(name, decode_cursor(encoded, 1)[0])
+                except QueryError:
+                    continue
+            raise VersionConflictError("If-Match does not match the current version")
+
+        version_id_col = inspect(model).version_id_col
+        if query.columns[name] is version_id_col and data.get(name) is not None:
+            return query.coerce(name, data[name])
+        return None
+
+    @staticmethod
+    def _next_version(mapper: Any, column: Any, expected: Any) -> Any:
+        """Compute the SET value that moves a version column forward.
+
+        Args:
+            mapper (Any): SQLAlchemy mapper of the model
+            column (Any): Version column
+            expected (Any): Current version, if known
+
+        Returns:
+            Any: Value or SQL expression, or None when the database or a column
+                `onupdate` already takes care of it
+        """
+        if column is mapper.version_id_col:
+            if mapper.version_id_generator is False:
+                return None  # Server-side versioning
+            if expected is not None:
+                return mapper.version_id_generator(expected)
+        if column.onupdate is not None or column.server_onupdate is not None:
+            return None
+
+        python_type = column.type.python_type
+        if python_type is int:
+            return column + 1
+        if python_type is datetime.datetime:
+            return func.now()
+        return None
+
+    def _update_row(
+        self, model: Any, id: Any, data: dict, version_key: Optional[str] = None
+    ) -> Any:
+        """Update one row with a single `UPDATE ... WHERE pk=:id RETURNING`.
+
+        No SELECT precedes the UPDATE. With a version column the statement is
+        also conditional on the version the client read, and only when it
+        matches no row is the primary key looked up, to tell a missing row
+        from a conflict.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            id (Any): Primary key value, or tuple for a composite key
+            data (dict): Request payload
+            version_key (Optional[str]): Attribute key of the version column
+
+        Returns:
+            Any: Updated row as a mapping, or None if the row does not exist
+
+        Raises:
+            VersionConflictError: If the row has another version
+        """
+        mapper = inspect(model)
+        table = mapper.local_table
+        query = self.query_builders[self._model_names[model]]
+        identity = query.identity_clause(id)
+        session = self.db.session
+
+        version = expected = None
+        if version_key is not None:
+            version = query.columns[query.column_names[version_key]]
+            expected = self._expected_version(model, version_key, data)
+            if (
+                expected is None
+                and version is mapper.version_id_col
+                and version.type.python_type is not int
+            ):
+                # A custom generator needs the current version to compute the next
+                statement = select(version).where(identity)
+                expected = session.execute(statement).scalar_one_or_none()
+                if expected is None:
+                    return None
+
+        values = {
+            query.columns[name]: query.coerce_payload(name, value)
+            for name, value in data.items()
+            if name in query.columns
+            and not query.columns[name].primary_key
+            and query.columns[name] is not version
+        }
+        if version is not None:
+            next_version = self._next_version(mapper, version, expected)
+            if next_version is not None:
+                values[version] = next_version
+
+        statement = update(table).where(identity)
+        if expected is not None:
+            statement = statement.where(version == expected)
+        if values:
+            statement = statement.values(values)
+        else:
+            # Nothing to change, but the row must still exist
+            key = query.key_columns[0]
+            statement = statement.values({key: key})
+
+        try:
+            if session.get_bind(mapper).dialect.update_returning:
+                row = session.execute(statement.returning(*table.columns)).first()
+            else:
+                row = None
+                if session.execute(statement).rowcount > 0:
+                    row = session.execute(
+                        select(*table.columns).where(identity)
+                    ).first()
+
+            if row is None:
+                session.rollback()
+                self._raise_if_conflict(model, id, expected)
+                return None
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        return row._mapping
+
+    def _delete_row(
+        self, model: Any, id: Any, version_key: Optional[str] = None
+    ) -> bool:
+        """Delete one row with a single `DELETE ... WHERE pk=:id`.
+
+        With a version column and `If-Match`, the statement is also
+        conditional on the version the client read.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            id (Any): Primary key value, or tuple for a composite key
+            version_key (Optional[str]): Attribute key of the version column
+
+        Returns:
+            bool: Whether a row was deleted
+
+        Raises:
+            VersionConflictError: If the row has another version
+        """
+        mapper = inspect(model)
+        query = self.query_builders[self._model_names[model]]
+        session = self.db.session
+
+        statement = delete(mapper.local_table).where(query.identity_clause(id))
+        expected = None
+        if version_key is not None:
+            expected = self._expected_version(model, version_key, {})
+            if expected is not None:
+                version = query.columns[query.column_names[version_key]]
+                statement = statement.where(version == expected)
+
+        try:
+            deleted = session.execute(statement).rowcount > 0
+            if not deleted:
+                session.rollback()
+                self._raise_if_conflict(model, id, expected)
+                return False
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        return True
+
+    def _raise_if_conflict(self, model: Any, id: Any, expected: Any) -> None:
+        """Explain why a conditional single-row write matched nothing.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            id (Any): Primary key value, or tuple for a composite key
+            expected (Any): Version the write was conditional on, if any
+
+        Raises:
+            VersionConflictError: If the row exists, so its version differs
+        """
+        if expected is None:
+            return
+        query = self.query_builders[self._model_names[model]]
+        statement = select(*query.key_columns).where(query.identity_clause(id))
+        if self.db.session.execute(statement).first() is not None:
+            raise VersionConflictError(
+                f"{self._model_names[model]} with id {id} "
+                "was modified by another request"
+            )
+
+    def _check_representation(self, instance: Any, api_model: Any) -> None:
+        """Compare `If-Match` with the ETag of an unversioned item.
+
+        Without a version column the tag is a hash of the serialized item, so
+        this needs the row, which the caller must have locked.
+
+        Args:
+            instance (Any): Current row
+            api_model (Any): Flask-RESTX model of the resource
+
+        Raises:
+            VersionConflictError: If no tag matches
+        """
+        if not request.if_match or request.if_match.star_tag:
+            return
+        data = self._marshal(instance, api_model)
+        response = self.api.make_response(data, HTTPStatus.OK)
+        response.add_etag()
+        if not request.if_match.contains(response.get_etag()[0]):
+            raise VersionConflictError("If-Match does not match the current version")
+
+    def _invalidate(
+        self, model_name: str, ids: List[Any] = (), bulk: bool = False
+    ) -> None:
+        """Retire the cached responses a committed write made stale.
+
+        Args:
+            model_name (str): Name of the written model
+            ids (List[Any]): Identifiers of the written items
+            bulk (bool): Whether the write may have changed any item
+        """
+        if self.response_cache is not None:
+            self.response_cache.invalidate(model_name, ids, bulk)
+            if self.read_replicas and self.read_your_writes:
+                self.response_cache.hold(model_name, self.read_your_writes)
+
+    def _stream_format(self, args: dict) -> Optional[str]:
+        """Work out whether the client asked for a streamed listing.
+
+        Args:
+            args (dict): Parsed query parameters
+
+        Returns:
+            Optional[str]: "ndjson", "json" or None for a regular response
+        """
+        if not self.streaming:
+            return None
+        if args.get("stream"):
+            return args["stream"]
+        accepted = request.accept_mimetypes.best_match(
+            ["application/json", NDJSON_MIMETYPE]
+        )
+        return "ndjson" if accepted == NDJSON_MIMETYPE else None
+
+    def _stream_rows(
+        self, statement: Any, api_model: Any, stream_format: str, core: bool = False
+    ) -> Response:
+        """Stream the rows of a query to the client as they are read.
+
+        Rows are fetched in server-side batches of `stream_batch_size` and
+        serialized one at a time, so the worker never holds more than one batch
+        in memory however large the collection is.
+
+        Args:
+            statement (Any): SELECT statement to stream
+            api_model (Any): Flask-RESTX model used to serialize each row
+            stream_format (str): "ndjson" or "json"
+            core (bool): Read row mappings with Core instead of ORM objects
+
+        Returns:
+            Response: Chunked streaming response
+        """
+        statement = statement.execution_options(yield_per=self.stream_batch_size)
+        result = self._execute(statement, core)
+        serialize = self._serializer(api_model, mapping=core)
+
+        def generate():
+            try:
+                if stream_format == "ndjson":
+                    for row in result:
+                        yield json.dumps(serialize(row)) + "\n"
+                    return
+
+                # Write the JSON array incrementally, one element at a time
+                yield "["
+                separator = ""
+                for row in result:
+                    yield separator + json.dumps(serialize(row))
+                    separator = ","
+                yield "]\n"
+            finally:
+                result.close()
+
+        mimetype = NDJSON_MIMETYPE if stream_format == "ndjson" else "application/json"
+        return current_app.response_class(
+            stream_with_context(generate()), mimetype=mimetype
+        )
+
+    def _create_endpoints(self, model_names: Optional[Iterable[str]] = None) -> None:
+        """Create API endpoints for each model.
+
+        Args:
+            model_names (Optional[Iterable[str]]): Models to create endpoints
+                for (default: all)
+        """
+        for model_name in self.models if model_names is None else model_names:
+            model = self.models[model_name]
+            # Get namespace and API model
+            namespace = self.namespaces[model_name]
+            api_model = self.api_models[model_name]
+            query_builder = self.query_builders[model_name]
+
+            # Create resource name (pluralized)
+            resource_name = inflection.pluralize(model_name.lower())
+
+            # Store db reference for use in inner classes
+            api = self
+            db = self.db
+            # Pass the flag to the resources
+            disable_delete = self.registry.option(
+                model_name, "disable_delete", self.disable_delete
+            )
+            paginate = self.paginate
+
+            # Query parameters accepted by the collection listing
+            list_parser = namespace.parser()
+            if paginate:
+                list_parser.add_argument(
+                    "cursor",
+                    type=str,
+                    location="args",
+                    help="Opaque cursor returned as `next` by the previous page",
+                )
+                list_parser.add_argument(
+                    "limit",
+                    type=int,
+                    location="args",
+                    help=f"Page size (default {self.page_size}, "
+                    f"max {self.max_page_size})",
+                )
+                list_model = namespace.model(
+                    f"{model_name}Page",
+                    {
+                        "items": fields.List(fields.Nested(api_model)),
+                        "next": fields.String(
+                            description="Cursor for the next page, null on the last"
+                        ),
+                    },
+                )
+            else:
+                list_model = [api_model]
+            list_parser.add_argument(
+                "fields",
+                type=str,
+                location="args",
+                help="Comma-separated fields to select (default: all)",
+            )
+            list_parser.add_argument(
+                "sort",
+                type=str,
+                location="args",
+                help="Comma-separated fields to sort by, prefix with - to descend",
+            )
+            list_parser.add_argument(
+                "count",
+                type=str,
+                choices=COUNT_MODES,
+                location="args",
+                help="How to compute X-Total-Count, at most as costly as the "
+                f"configured mode ({self._configured_count_mode(model_name)})",
+            )
+            if self.max_expand_depth:
+                relationships = ", ".join(inspect(model).relationships.keys())
+                expand_help = (
+                    "Comma-separated relationships to embed, nested with dots "
+                    f"up to depth {self.max_expand_depth} (one of: {relationships})"
+                )
+                list_parser.add_argument(
+                    "expand", type=str, location="args", help=expand_help
+                )
+
+            # Request and response bodies of the bulk operations
+            bulk_delete_model = namespace.model(
+                f"{model_name}BulkDelete",
+                {
+                    "ids": fields.List(
+                        fields.Raw, description="Identifiers of the rows to change"
+                    ),
+                    "filter": fields.Raw(
+                        description='Filters such as {"name__like": "a%"}'
+                    ),
+                },
+            )
+            bulk_update_model = namespace.clone(
+                f"{model_name}BulkUpdate",
+                bulk_delete_model,
+                {"values": fields.Nested(api_model, required=True)},
+            )
+            bulk_result_model = namespace.model(
+                f"{model_name}BulkResult",
+                {"affected": fields.Integer(description="Number of rows changed")},
+            )
+
+            ids_model = namespace.model(
+                f"{model_name}Ids",
+                {
+                    "ids": fields.List(
+                        fields.Raw, required=True, description="Identifiers to fetch"
+                    )
+                },
+            )
+            batch_model = namespace.model(
+                f"{model_name}Batch",
+                {
+                    "items": fields.List(fields.Nested(api_model)),
+                    "missing": fields.List(
+                        fields.Raw, description="Requested identifiers not found"
+                    ),
+                },
+            )
+
+            # Query parameters accepted by the item resource
+            item_parser = namespace.parser()
+            item_parser.add_argument(
+                "fields",
+                type=str,
+                location="args",
+                help="Comma-separated fields to select (default: all)",
+            )
+            if self.max_expand_depth:
+                item_parser.add_argument(
+                    "expand", type=str, location="args", help=expand_help
+                )
+
+            list_mimetypes = ["application/json"]
+            if self.streaming:
+                list_mimetypes.append(NDJSON_MIMETYPE)
+                list_parser.add_argument(
+                    "stream",
+                    type=str,
+                    choices=("ndjson", "json"),
+                    location="args",
+                    help="Stream the whole collection as NDJSON or a JSON array "
+                    f"(also selected by `Accept: {NDJSON_MIMETYPE}`)",
+                )
+
+            # Create a factory function to ensure each class has its own bound model
+            def create_collection_resource(model, model_name):
+                """Create a collection resource for the model."""
+
+                @namespace.route("/", endpoint=f"{resource_name}_collection")
+                @namespace.response(HTTPStatus.NOT_FOUND, f"{model_name} not found")
+                @namespace.response(HTTPStatus.BAD_REQUEST, "Invalid request")
+                @namespace.response(
+                    HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error"
+                )  # noqa: E501
+                @namespace.doc(f"get_{resource_name}")
+                class Collection(Resource):
+                    """Collection resource for the model."""
+
+                    # Store model references securely
+                    _model = model
+                    _model_name = model_name
+                    _want_logs = self.want_logs
+                    _disable_delete = disable_delete
+                    _api_model = api_model
+                    _parser = list_parser
+                    _query = query_builder
+                    _reserved = {argument.name for argument in list_parser.args}
+                    _core = self.core_reads and self._supports_core_reads(model)
+
+                    @namespace.doc(f"list_{resource_name}")
+                    @namespace.expect(list_parser)
+                    @namespace.response(HTTPStatus.OK, "Success", list_model)
+                    @namespace.produces(list_mimetypes)
+                    @api._conditional
+                    @api._cached
+                    def get(self):
+                        """Get all resources.
+
+                        Filter with `<field>=<value>` or `<field>__<op>=<value>`,
+                        where op is one of eq, ne, lt, lte, gt, gte, in, like,
+                        ilike or isnull.
+                        """
+                        args = self._parser.parse_args()
+                        query_args = list(request.args.items(multi=True))
+                        return api._routed_read(self._list, args, query_args)
+
+                    def _list(self, session, args, query_args):
+                        """List the resources with the given session."""
+                        try:
+                            options, output_fields = api._projection(
+                                self._model, self._api_model, args["fields"]
+                            )
+                            expand_options, output_fields = api._expansion(
+                                self._model, output_fields, args.get("expand")
+                            )
+                            options += expand_options
+                            order_by = self._query.order_by(args["sort"])
+
+                            # Embedded relationships need ORM objects
+                            core = self._core and not expand_options
+                            if core:
+                                # Read plain rows from the table, skipping ORM
+                                # object loading and the identity map
+                                columns = self._query.select_columns(
+                                    output_fields, order_by if paginate else ()
+                                )
+                                statement = select(*columns)
+                            else:
+                                statement = select(self._model).options(*options)
+
+                            filters = self._query.filters(
+                                query_args, reserved=self._reserved
+                            )
+                            statement = statement.where(*filters)
+                            count_mode = api._count_mode(
+                                self._model_name, args["count"]
+                            )
+                            if args["sort"]:
+                                statement = statement.order_by(*order_clauses(order_by))
+
+                            stream_format = api._stream_format(args)
+                            if stream_format:
+                                return api._stream_rows(
+                                    statement, output_fields, stream_format, core
+                                )
+
+                            if not paginate:
+                                # Use direct query with the bound model
+                                rows = api._execute(statement, core, session).all()
+                                headers = {}
+                                if count_mode != "none":
+                                    # Every row is here, so counting is free
+                                    headers["X-Total-Count"] = str(len(rows))
+                                data = api._marshal(rows, output_fields, core)
+                                return data, HTTPStatus.OK, headers
+
+                            page = api._keyset_page(
+                                self._query,
+                                statement.order_by(None),
+                                order_by,
+                                args["cursor"],
+                                args["limit"],
+                                core,
+                                session,
+                            )
+                            total = api._count(
+                                self._model,
+                                statement,
+                                count_mode,
+                                bool(filters),
+                                session,
+                            )
+                        except QueryError as e:
+                            namespace.abort(HTTPStatus.BAD_REQUEST, str(e))
+
+                        page["items"] = api._marshal(page["items"], output_fields, core)
+                        headers = {}
+                        if total is not None:
+                            headers["X-Total-Count"] = str(total)
+                        return page, HTTPStatus.OK, headers
+
+                    @namespace.doc(f"create_{inflection.singularize(resource_name)}")
+                    @namespace.expect(api_model, validate=False)
+                    @namespace.marshal_with(api_model, code=HTTPStatus.CREATED)
+                    def post(self):
+                        """Create a new resource, or several from a JSON array.
+
+                        An array is inserted in a single transaction. If any
+                        row is rejected nothing is written, and the response
+                        lists the index of every rejected row.
+                        """
+                        # Get request data
+                        data = namespace.payload
+                        rows = data if isinstance(data, list) else [data]
+
+                        # Validate like `expect` does, one array element at a time
+                        if self.api._validate:
+                            for row in rows:
+                                self._api_model.validate(
+                                    row, self.api.refresolver, self.api.format_checker
+                                )
+
+                        if isinstance(data, list):
+                            if self._want_logs:
+                                logger.info(
+                                    f"Creating {len(data)} {self._model_name} instances"
+                                )
+                            try:
+                                created = api._bulk_create(self._model, data)
+                            except BulkWriteError as e:
+                                namespace.abort(
+                                    HTTPStatus.BAD_REQUEST, str(e), errors=e.errors
+                                )
+                            except Exception as e:
+                                logger.error(f"Error creating {self._model_name}: {e}")
+                                namespace.abort(
+                                    HTTPStatus.INTERNAL_SERVER_ERROR,
+                                    f"Error creating {self._model_name}",
+                                )
+                            api._invalidate(self._model_name)
+                            return created, HTTPStatus.CREATED
+
+                        if self._want_logs:
+                            logger.info(f"Creating a new {self._model_name} instance")
+
+                        # Validate required fields
+                        missing = api._missing_field(self._model, data)
+                        if missing:
+                            namespace.abort(400, f"Missing required field: {missing}")
+
+                        # Create new instance using the class's model
+                        instance = self._model()
+
+                        # Update instance with request data
+                        for key, value in data.items():
+                            if hasattr(instance, key):
+                                setattr(instance, key, value)
+
+                        # Save to database
+                        db.session.add(instance)
+                        try:
+                            db.session.commit()
+                        except IntegrityError as e:
+                            db.session.rollback()
+                            logger.error(
+                                f"Integrity error creating {self._model_name}: {e}"
+                            )  # noqa: E501
+                            namespace.abort(
+                                HTTPStatus.BAD_REQUEST,
+                                f"Integrity error creating {self._model_name}",
+                            )
+                        except Exception as e:
+                            db.session.rollback()
+                            logger.error(f"Error creating {self._model_name}: {e}")
+                            namespace.abort(
+                                HTTPStatus.INTERNAL_SERVER_ERROR,
+                                f"Error creating {self._model_name}",
+                            )
+
+                        api._invalidate(self._model_name)
+                        return instance, HTTPStatus.CREATED
+
+                    @namespace.doc(f"update_{resource_name}")
+                    @namespace.expect(bulk_update_model, validate=False)
+                    @namespace.response(HTTPStatus.OK, "Success", bulk_result_model)
+                    def patch(self):
+                        """Update every resource matching `ids` and/or `filter`.
+
+                        Runs a single `UPDATE ... WHERE` statement. `filter`
+                        uses the same `<field>__<op>` names as list filters.
+                        """
+                        data = namespace.payload
+                        try:
+                            affected = api._bulk_update(self._model, data)
+                        except QueryError as e:
+                            namespace.abort(HTTPStatus.BAD_REQUEST, str(e))
+                        except IntegrityError as e:
+                            logger.error(
+                                f"Integrity error updating {self._model_name}: {e}"
+                            )
+                            namespace.abort(
+                                HTTPStatus.BAD_REQUEST,
+                                f"Integrity error updating {self._model_name}",
+                            )
+                        api._invalidate(self._model_name, bulk=True)
+                        return {"affected": affected}
+
+                    # Only include delete method if deletion is not disabled
+                    if not _disable_delete:
+
+                        @namespace.doc(f"delete_{resource_name}")
+                        @namespace.expect(bulk_delete_model, validate=False)
+                        @namespace.response(HTTPStatus.OK, "Success", bulk_result_model)
+                        def delete(self):
+                            """Delete every resource matching `ids` and/or `filter`.
+
+                            Runs a single `DELETE ... WHERE` statement.
+                            """
+                            data = namespace.payload
+                            try:
+                                affected = api._bulk_delete(self._model, data)
+                            except QueryError as e:
+                                namespace.abort(HTTPStatus.BAD_REQUEST, str(e))
+                            except IntegrityError as e:
+                                logger.error(
+                                    f"Integrity error deleting {self._model_name}: {e}"
+                                )
+                                namespace.abort(
+                                    HTTPStatus.BAD_REQUEST,
+                                    f"Integrity error deleting {self._model_name}",
+                                )
+                            api._invalidate(self._model_name, bulk=True)
+                            return {"affected": affected}
+
+                return Collection
+
+            # Similar factory for Item resource...
+            def create_item_resource(model, model_name):
+                item_route, key_names = self._item_route(model)
+
+                @namespace.route(item_route, endpoint=f"{resource_name}_item")
+                @namespace.doc(
+                    params={name: f"The {model_name} {name}" for name in key_names}
+                    if len(key_names) > 1
+                    else {"id": f"The {model_name} identifier"}
+                )
+                @namespace.response(HTTPStatus.NOT_FOUND, f"{model_name} not found")
+                @namespace.response(HTTPStatus.BAD_REQUEST, "Invalid request")
+                @namespace.response(
+                    HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error"
+                )  # noqa: E501
+                class Item(Resource):
+                    """Resource for a specific item."""
+
+                    # Store model references securely
+                    _model = model
+                    _model_name = model_name
+                    _want_logs = self.want_logs
+                    _disable_delete = disable_delete
+                    _api_model = api_model
+                    _parser = item_parser
+                    _version = self._version_column(model_name, model)
+                    _single_table = self._supports_core_reads(model)
+                    _key_names = key_names
+
+                    @namespace.doc(f"get_{inflection.singularize(resource_name)}")
+                    @namespace.expect(item_parser)
+                    @namespace.response(HTTPStatus.OK, "Success", api_model)
+                    @namespace.response(HTTPStatus.NOT_MODIFIED, "Not modified")
+                    @api._conditional
+                    @api._cached
+                    def get(self, **key):
+                        """Get a specific resource."""
+                        id = api._item_identity(self, key)
+                        args = self._parser.parse_args()
+                        return api._routed_read(self._read, id, args)
+
+                    def _read(self, session, id, args):
+                        """Read a resource with the given session."""
+                        try:
+                            options, output_fields = api._projection(
+                                self._model, self._api_model, args["fields"]
+                            )
+                            expand_options, output_fields = api._expansion(
+                                self._model, output_fields, args.get("expand")
+                            )
+                        except QueryError as e:
+                            namespace.abort(HTTPStatus.BAD_REQUEST, str(e))
+
+                        options += expand_options
+                        instance = session.get(self._model, id, options=options)
+                        if not instance:
+                            namespace.abort(
+                                HTTPStatus.NOT_FOUND,
+                                f"{self._model_name} with id {id} not found",  # noqa: E501
+                            )
+                        if api.read_replicas and self._version is not None:
+                            # Validators must match the row the body comes from
+                            g._api_row_version = getattr(instance, self._version)
+                        return api._marshal(instance, output_fields)
+
+                    @namespace.doc(f"update_{inflection.singularize(resource_name)}")
+                    @namespace.expect(api_model)
+                    @namespace.marshal_with(api_model)
+                    @namespace.response(
+                        HTTPStatus.PRECONDITION_FAILED, "Modified by another request"
+                    )
+                    def put(self, **key):
+                        """Update a specific resource.
+
+                        Send the ETag of the representation being edited in
+                        `If-Match` (or, for models with a version column, the
+                        version field) to get a 412 instead of overwriting a
+                        newer change.
+                        """
+                        id = api._item_identity(self, key)
+                        if self._want_logs:
+                            logger.debug(f"Updating {self._model_name} with id {id}")
+
+                        # Get request data
+                        data = namespace.payload
+
+                        try:
+                            if self._single_statement():
+                                # One UPDATE ... RETURNING, without reading first
+                                instance = api._update_row(
+                                    self._model, id, data, self._version
+                                )
+                            else:
+                                instance = self._update_instance(id, data)
+                        except QueryError as e:
+                            namespace.abort(HTTPStatus.BAD_REQUEST, str(e))
+                        except VersionConflictError as e:
+                            namespace.abort(HTTPStatus.PRECONDITION_FAILED, str(e))
+
+                        if instance is None:
+                            logger.warning(f"{self._model_name} with id {id} not found")
+                            namespace.abort(
+                                HTTPStatus.NOT_FOUND,
+                                f"{self._model_name} with id {id} not found",
+                            )
+
+                        api._invalidate(self._model_name, [id])
+                        return instance
+
+                    def _single_statement(self):
+                        """Check whether this write can skip loading the row."""
+                        if not self._single_table:
+                            return False
+                        if self._version is not None:
+                            return True
+                        # Unversioned If-Match checks need the row's content
+                        return api.fast_writes and not request.if_match
+
+                    def _load_checked(self, id, data):
+                        """Load a resource and check the client's If-Match."""
+                        expected = None
+                        if self._version is not None:
+                            expected = api._expected_version(
+                                self._model, self._version, data
+                            )
+
+                        # Lock the row while an unversioned If-Match is checked
+                        locked = self._version is None and bool(request.if_match)
+                        instance = db.session.get(
+                            self._model, id, with_for_update=locked
+                        )
+                        if not instance:
+                            return None
+
+                        if self._version is None:
+                            api._check_representation(instance, self._api_model)
+                        elif expected is not None:
+                            if getattr(instance, self._version) != expected:
+                                raise VersionConflictError(
+                                    f"{self._model_name} with id {id} was "
+                                    "modified by another request"
+                                )
+                        return instance
+
+                    def _update_instance(self, id, data):
+                        """Update a resource through the ORM."""
+                        try:
+                            instance = self._load_checked(id, data)
+                            if not instance:
+                                return None
+
+                            # Update instance with request data; the version
+                            # only moves forward through the mapper
+                            query = api.query_builders[self._model_name]
+                            for key, value in data.items():
+                                if hasattr(instance, key) and key != self._version:
+                                    if key in query.columns:
+                                        value = query.coerce_payload(key, value)
+                                    setattr(instance, key, value)
+
+                            # Save to database
+                            db.session.commit()
+                        except StaleDataError:
+                            db.session.rollback()
+                            raise VersionConflictError(
+                                f"{self._model_name} with id {id} was modified "
+                                "by another request"
+                            )
+                        except (QueryError, VersionConflictError):
+                            db.session.rollback()
+                            raise
+                        return instance
+
+                    # Only include delete method if deletion is not disabled
+                    if not _disable_delete:
+
+                        @namespace.doc(
+                            f"delete_{inflection.singularize(resource_name)}"
+                        )
+                        @namespace.response(
+                            HTTPStatus.NO_CONTENT, f"{model_name} deleted"
+                        )
+                        @namespace.response(
+                            HTTPStatus.PRECONDITION_FAILED,
+                            "Modified by another request",
+                        )
+                        def delete(self, **key):
+                            """Delete a specific resource."""
+                            id = api._item_identity(self, key)
+                            try:
+                                # Core deletes skip ORM cascades, so opt-in only
+                                if api.fast_writes and self._single_statement():
+                                    # One DELETE, without reading first
+                                    deleted = api._delete_row(
+                                        self._model, id, self._version
+                                    )
+                                else:
+                                    deleted = self._delete_instance(id)
+                            except VersionConflictError as e:
+                                namespace.abort(HTTPStatus.PRECONDITION_FAILED, str(e))
+
+                            if not deleted:
+                                namespace.abort(
+                                    HTTPStatus.NOT_FOUND,
+                                    f"{self._model_name} with id {id} not found",  # noqa: E501
+                                )
+                            api._invalidate(self._model_name, [id])
+
+                            return "", HTTPStatus.NO_CONTENT
+
+                        def _delete_instance(self, id):
+                            """Delete a resource through the ORM."""
+                            try:
+                                instance = self._load_checked(id, {})
+                                if not instance:
+                                    return False
+
+                                # Delete from database
+                                db.session.delete(instance)
+                                db.session.commit()
+                            except StaleDataError:
+                                db.session.rollback()
+                                raise VersionConflictError(
+                                    f"{self._model_name} with id {id} was modified "
+                                    "by another request"
+                                )
+                            except VersionConflictError:
+                                db.session.rollback()
+                                raise
+                            return True
+
+                return Item
+
+            # Resource fetching many items by id in one request
+            def create_batch_resource(model, model_name):
+                @namespace.route("/batch-get", endpoint=f"{resource_name}_batch")
+                @namespace.response(HTTPStatus.BAD_REQUEST, "Invalid request")
+                class Batch(Resource):
+                    """Resource fetching several items at once."""
+
+                    _model = model
+                    _model_name = model_name
+                    _api_model = api_model
+                    _parser = item_parser
+                    _core = self.core_reads and self._supports_core_reads(model)
+
+                    @namespace.doc(f"batch_get_{resource_name}")
+                    @namespace.expect(ids_model, item_parser, validate=False)
+                    @namespace.response(HTTPStatus.OK, "Success", batch_model)
+                    def post(self):
+                        """Get the resources with the given ids.
+
+                        Items come back in the order of `ids`, and ids that
+                        match nothing are listed under `missing`.
+                        """
+                        args = self._parser.parse_args()
+                        try:
+                            options, output_fields = api._projection(
+                                self._model, self._api_model, args["fields"]
+                            )
+                            expand_options, output_fields = api._expansion(
+                                self._model, output_fields, args.get("expand")
+                            )
+                            core = self._core and not expand_options
+                            rows, missing = api._batch_get(
+                                self._model,
+                                namespace.payload,
+                                options + expand_options,
+                                output_fields,
+                                core,
+                            )
+                        except QueryError as e:
+                            namespace.abort(HTTPStatus.BAD_REQUEST, str(e))
+
+                        return {
+                            "items": api._marshal(rows, output_fields, core),
+                            "missing": missing,
+                        }
+
+                return Batch
 
             # Create the resources using our factory functions
             create_collection_resource(model, model_name)
             create_item_resource(model, model_name)
+            create_batch_resource(model, model_name)
 
             if self.want_logs:
                 logger.info(f"Created endpoints for {model_name}")
@@ -0,0 +1,65 @@
+# src/flask_api_sqlalchemy/budget.py
+# Per-request statement counting for query budgets
+import time
+from collections import Counter
+from typing import Any, List, Tuple
+
+from flask import g, has_app_context
+from sqlalchemy import event
+
+# Attribute of `flask.g` holding the statistics of the current request
+STATS_ATTRIBUTE = "_api_query_stats"
+
+
+class QueryStats:
+    """Statements an engine ran while serving one request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()  # SQL -> times run
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """List the statements run at least `threshold` times.
+
+        The same SQL run again and again, with other parameters, usually
+        comes from a relationship loaded one row at a time (N+1 queries).
+
+        Args:
+            threshold (int): Least number of runs to report
+
+        Returns:
+            List[Tuple[str, int]]: (SQL, runs), most run first
+        """
+        return [
+            (statement, runs)
+            for statement, runs in self.statements.most_common()
+            if runs >= threshold
+        ]
+
+
+def instrument(engine: Any) -> None:
+    """Count the statements of an engine into the current request's stats.
+
+    Statements run outside a request, or in a request that does not collect
+    statistics, are ignored. Instrumenting an engine twice has no effect.
+
+    Args:
+        engine (Any): SQLAlchemy engine
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_execute):
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("api_query_start", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["api_query_start"].pop()
+    stats = g.get(STATS_ATTRIBUTE) if has_app_context() else None
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.statements[statement] += 1
@@ -0,0 +1,271 @@
+# src/flask_api_sqlalchemy/cache.py
+# Response cache backends for the generated GET endpoints
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+class CacheBackend:
+    """Interface of the key-value stores the response cache can use.
+
+    Backends only need to store opaque values with an optional time to live.
+    Losing any key at any time (eviction, restart) is always safe.
+    """
+
+    def get(self, key: str) -> Any:
+        """Return the value stored under `key`, or None."""
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[str]) -> List[Any]:
+        """Return the values stored under `keys`, with None for missing keys."""
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store `value` under `key`, expiring after `ttl` seconds if given."""
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        """Remove `keys` if present."""
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with per-entry expiry.
+
+    Each worker process keeps its own copy, so invalidations made by one
+    process are not seen by the others; use a shared backend such as
+    `RedisCache` when running several workers.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_entries (int): Entries kept before the least recently used
+                ones are evicted
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # Key -> (expires at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """Backend storing entries in Redis, shared by every worker process.
+
+    Any client with the redis-py `get`/`mget`/`set`/`delete` methods works.
+    """
+
+    def __init__(self, client: Any, prefix: str = "flask-api-sqlalchemy:") -> None:
+        """Wrap a Redis client.
+
+        Args:
+            client (Any): Client such as `redis.Redis(...)`
+            prefix (str): Prefix of every key, to share a Redis database
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any:
+        return self.client.get(self.prefix + key)
+
+    def get_many(self, keys: Iterable[str]) -> List[Any]:
+        # One round trip for every key
+        return self.client.mget([self.prefix + key for key in keys])
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self.client.set(self.prefix + key, value, ex=ttl or None)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*[self.prefix + key for key in keys])
+
+
+class ResponseCache:
+    """Cache serialized GET responses and invalidate them after writes.
+
+    Entry keys embed generation tokens instead of being deleted one by one:
+
+    - `<model>:list` changes on every write, for collection responses
+    - `<model>:item:<id>` changes when that item is updated or deleted
+    - `<model>:all` changes on bulk writes, for every item response
+
+    Responses embedding other models (`?expand=`) also carry the `list`
+    tokens of those models, so a write to any of them retires the response.
+
+    A write deletes the token, so every response cached under it is never
+    read again and simply expires. A token that is missing (never set,
+    deleted, evicted or expired) is replaced by a new one on the next read.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: Optional[int] = 60) -> None:
+        """Create the cache.
+
+        Args:
+            backend (CacheBackend): Store for responses and tokens
+            ttl (Optional[int]): Seconds a response stays cached
+        """
+        self.backend = backend
+        self.ttl = ttl
+
+    def _tokens(self, keys: List[str]) -> List[str]:
+        """Read generation tokens, creating the missing ones.
+
+        Args:
+            keys (List[str]): Token keys
+
+        Returns:
+            List[str]: Current tokens
+        """
+        tokens = []
+        for key, token in zip(keys, self.backend.get_many(keys)):
+            if token is None:
+                token = uuid.uuid4().hex
+                self.backend.set(key, token, self.ttl)
+            elif isinstance(token, bytes):
+                token = token.decode("ascii")
+            tokens.append(token)
+        return tokens
+
+    def key(
+        self,
+        model_name: str,
+        variant: str,
+        id: Any = None,
+        related: Iterable[str] = (),
+    ) -> str:
+        """Build the key of a response.
+
+        Args:
+            model_name (str): Name of the model
+            variant (str): Everything else that changes the response body,
+                such as the query string and relevant headers
+            id (Any): Item identifier, or None for the collection
+            related (Iterable[str]): Names of the other models embedded in
+                the response
+
+        Returns:
+            str: Entry key
+        """
+        if id is None:
+            scope = "list"
+            token_keys = [f"{model_name}:list"]
+        else:
+            scope = f"item:{id}"
+            token_keys = [f"{model_name}:all", f"{model_name}:item:{id}"]
+        token_keys.extend(f"{name}:list" for name in related)
+        tokens = self._tokens(token_keys)
+        digest = hashlib.sha1(variant.encode("utf-8")).hexdigest()
+        return f"{model_name}:{scope}:{':'.join(tokens)}:{digest}"
+
+    def get(self, key: str) -> Optional[Tuple[str, List[Tuple[str, str]], bytes]]:
+        """Look up a cached response.
+
+        Args:
+            key (str): Entry key
+
+        Returns:
+            Optional[Tuple[str, List[Tuple[str, str]], bytes]]: (mimetype,
+                headers, body), or None on a miss
+        """
+        value = self.backend.get(key)
+        if value is None:
+            return None
+        meta, _, body = value.partition(b"\n")
+        mimetype, headers = json.loads(meta)
+        return mimetype, [tuple(header) for header in headers], body
+
+    def set(
+        self,
+        key: str,
+        mimetype: str,
+        body: bytes,
+        headers: Iterable[Tuple[str, str]] = (),
+    ) -> None:
+        """Store a response.
+
+        Args:
+            key (str): Entry key
+            mimetype (str): Content type of the response
+            body (bytes): Serialized response body
+            headers (Iterable[Tuple[str, str]]): Extra headers to replay, such
+                as `X-Total-Count`
+        """
+        meta = json.dumps([mimetype, list(headers)]).encode("utf-8")
+        self.backend.set(key, meta + b"\n" + body, self.ttl)
+
+    def hold(self, model_name: str, seconds: int) -> None:
+        """Mark a model as recently written, for `seconds`.
+
+        Args:
+            model_name (str): Name of the written model
+            seconds (int): How long replicas may lag behind the write
+        """
+        self.backend.set(f"{model_name}:held", b"1", seconds)
+
+    def held(self, *model_names: str) -> bool:
+        """Tell whether any of the models was written within its hold time.
+
+        Args:
+            *model_names (str): Names of the models
+
+        Returns:
+            bool: Whether responses read from a replica may be stale
+        """
+        keys = [f"{model_name}:held" for model_name in model_names]
+        return any(value is not None for value in self.backend.get_many(keys))
+
+    def invalidate(
+        self, model_name: str, ids: Iterable[Any] = (), bulk: bool = False
+    ) -> None:
+        """Retire the responses a write may have made stale.
+
+        Collection responses are always retired.
+
+        Args:
+            model_name (str): Name of the written model
+            ids (Iterable[Any]): Identifiers of the written items
+            bulk (bool): Retire every item response of the model, for writes
+                whose rows are not known one by one
+        """
+        keys = [f"{model_name}:list"]
+        keys.extend(f"{model_name}:item:{id}" for id in ids)
+        if bulk:
+            keys.append(f"{model_name}:all")
+        self.backend.delete(*keys)
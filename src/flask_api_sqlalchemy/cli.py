@@ -4,7 +4,7 @@ import argparse
 import importlib
 import os
 import sys
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from . import __version__
 
@@ -53,6 +53,19 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
         "app_module", help="Path to the app module (e.g., app:app)"
     )
 
+    # Export-spec command to write the Swagger spec as a build artifact
+    export_parser = subparsers.add_parser(
+        "export-spec", help="Write the Swagger spec of an application to a file"
+    )
+    export_parser.add_argument(
+        "app_module", help="Path to the app module (e.g., app:app)"
+    )
+    export_parser.add_argument(
+        "--output",
+        default="swagger.json",
+        help="File to write (default: swagger.json)",
+    )
+
     return parser.parse_args(args)
 
 
@@ -125,47 +138,100 @@ flask-api-sqlalchemy>=0.1.6
     print(f"  python {name}.py")
 
 
-def show_app_info(app_module: str) -> None:
-    """Show information about detected models in an application.
+def load_extension(app_module: str) -> Any:
+    """Import an application and find its flask-api-sqlalchemy extension.
 
     Args:
         app_module (str): Path to the app module (e.g., app:app)
+
+    Returns:
+        Any: The `Api` instance, or None if the app does not use it
+
+    Raises:
+        ValueError: If `app_module` is not in 'module:app_variable' format
+        ImportError: If the module cannot be imported
+        AttributeError: If the module has no such app variable
+    """
+    module_path, app_var = app_module.split(":")
+    sys.path.insert(0, os.getcwd())
+
+    # Import the module
+    module = importlib.import_module(module_path)
+    app = getattr(module, app_var)
+
+    # Check if our extension is initialized
+    for extension in getattr(app, "extensions", {}).values():
+        if hasattr(extension, "_discover_models"):
+            return extension
+    return None
+
+
+def export_spec(app_module: str, output: str) -> int:
+    """Write the Swagger spec of an application to a file.
+
+    Args:
+        app_module (str): Path to the app module (e.g., app:app)
+        output (str): File to write
+
+    Returns:
+        int: Exit code
     """
     try:
-        module_path, app_var = app_module.split(":")
-        sys.path.insert(0, os.getcwd())
-
-        # Import the module
-        module = importlib.import_module(module_path)
-        app = getattr(module, app_var)
-
-        # Check if our extension is initialized
-        for extension in getattr(app, "extensions", {}).values():
-            if hasattr(extension, "_discover_models"):
-                # Found our extension
-                print(f"Found flask-api-sqlalchemy extension in {app_module}")
-                print("\nDetected models:")
-                for model_name in extension.models:
-                    print(f"  - {model_name}")
-                print("\nAPI endpoints:")
-                for model_name in extension.models:
-                    resource_name = model_name.lower() + "s"  # Simple pluralization
-                    print(f"  - GET    /api/{resource_name}/")
-                    print(f"  - POST   /api/{resource_name}/")
-                    print(f"  - GET    /api/{resource_name}/<id>")
-                    print(f"  - PUT    /api/{resource_name}/<id>")
-                    print(f"  - DELETE /api/{resource_name}/<id>")
-                print("\nSwagger documentation available at:")
-                print("  http://localhost:5000/api/docs")
-                return
+        extension = load_extension(app_module)
+    except (ImportError, AttributeError, ValueError) as e:
+        print(f"Could not load {app_module}: {e}")
+        return 1
 
+    if extension is None:
         print(f"flask-api-sqlalchemy extension not found in {app_module}")
+        return 1
+
+    try:
+        extension.export_spec(output)
+    except (OSError, RuntimeError) as e:
+        print(f"Could not export the Swagger spec of {app_module}: {e}")
+        return 1
+    print(f"Swagger spec written to {os.path.abspath(output)}")
+    return 0
+
+
+def show_app_info(app_module: str) -> None:
+    """Show information about detected models in an application.
+
+    Args:
+        app_module (str): Path to the app module (e.g., app:app)
+    """
+    try:
+        extension = load_extension(app_module)
     except ImportError:
-        print(f"Could not import module {module_path}")
+        print(f"Could not import module {app_module.split(':')[0]}")
+        return
     except AttributeError:
+        module_path, app_var = app_module.split(":")
         print(f"Could not find app variable {app_var} in module {module_path}")
+        return
     except ValueError:
         print("Invalid app module format. Use 'module:app_variable'")
+        return
+
+    if extension is None:
+        print(f"flask-api-sqlalchemy extension not found in {app_module}")
+        return
+
+    print(f"Found flask-api-sqlalchemy extension in {app_module}")
+    print("\nDetected models:")
+    for model_name in extension.models:
+        print(f"  - {model_name}")
+    print("\nAPI endpoints:")
+    for model_name in extension.models:
+        resource_name = model_name.lower() + "s"  # Simple pluralization
+        print(f"  - GET    /api/{resource_name}/")
+        print(f"  - POST   /api/{resource_name}/")
+        print(f"  - GET    /api/{resource_name}/<id>")
+        print(f"  - PUT    /api/{resource_name}/<id>")
+        print(f"  - DELETE /api/{resource_name}/<id>")
+    print("\nSwagger documentation available at:")
+    print("  http://localhost:5000/api/docs")
 
 
 def main(args: Optional[List[str]] = None) -> int:
@@ -191,6 +257,9 @@ def main(args: Optional[List[str]] = None) -> int:
         show_app_info(parsed_args.app_module)
         return 0
 
+    elif parsed_args.command == "export-spec":
+        return export_spec(parsed_args.app_module, parsed_args.output)
+
     return 0
 
 
@@ -16,3 +16,29 @@ class ModelMappingError(ApiError):
     """Exception raised when model mapping fails."""
 
     pass
+
+
+class QueryError(ApiError):
+    """Exception raised when request query parameters are invalid."""
+
+    pass
+
+
+class BulkWriteError(ApiError):
+    """Exception raised when rows of a bulk write are rejected."""
+
+    def __init__(self, message: str, errors: list) -> None:
+        super().__init__(message)
+        self.errors = errors  # One {"index": ..., "message": ...} per bad row
+
+
+class VersionConflictError(ApiError):
+    """Exception raised when a conditional write finds a different row version."""
+
+    pass
+
+
+class QueryBudgetError(ApiError):
+    """Exception raised when a request runs more SQL statements than allowed."""
+
+    pass
@@ -0,0 +1,158 @@
+# src/flask_api_sqlalchemy/metrics.py
+# Request metrics of the generated endpoints in Prometheus text format
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Attribute of `flask.g` holding the measurements of the current request
+METRICS_ATTRIBUTE = "_api_request_metrics"
+
+# Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Help text and type of every metric, in rendering order
+METRICS = {
+    "api_requests_total": ("Requests served, by status", "counter"),
+    "api_request_duration_seconds": (
+        "Request latency: total, in SQL statements (db), and serializing rows",
+        "histogram",
+    ),
+    "api_rows_returned_total": ("Rows serialized into responses", "counter"),
+    "api_response_bytes_total": ("Bytes of response bodies", "counter"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class RequestMetrics:
+    """Measurements of one request, recorded when it ends."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.serialize_seconds = 0.0
+        self.rows = 0
+
+
+class Metrics:
+    """Counters and latency histograms of the API's requests.
+
+    Each thread updates a shard of its own, so recording takes no lock;
+    rendering sums the shards. A thread reuses the shard of a finished
+    thread with the same identifier, which keeps the shards bounded by the
+    number of threads alive at once.
+    """
+
+    def __init__(self, buckets: Optional[Iterable[float]] = None) -> None:
+        """Create empty metrics.
+
+        Args:
+            buckets (Optional[Iterable[float]]): Upper bounds of the latency
+                histogram buckets, in seconds
+        """
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        self._shards = {}  # Thread identifier -> (counters, histograms)
+        self._lock = threading.Lock()  # Only taken to add a shard
+
+    def _shard(self) -> Tuple[Dict, Dict]:
+        """Get the current thread's counters and histograms."""
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            shard = (defaultdict(float), {})
+            with self._lock:
+                self._shards[ident] = shard
+        return shard
+
+    def inc(self, name: str, labels: Labels, value: float = 1) -> None:
+        """Add to a counter.
+
+        Args:
+            name (str): Metric name
+            labels (Labels): (label, value) pairs
+            value (float): Amount to add
+        """
+        self._shard()[0][name, labels] += value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """Record a value in a histogram.
+
+        Args:
+            name (str): Metric name
+            labels (Labels): (label, value) pairs
+            value (float): Observed value
+        """
+        histograms = self._shard()[1]
+        histogram = histograms.get((name, labels))
+        if histogram is None:
+            # One count per bucket, then +Inf, then the sum
+            histogram = histograms[name, labels] = [0] * (len(self.buckets) + 1)
+            histogram.append(0.0)
+        histogram[bisect_left(self.buckets, value)] += 1
+        histogram[-1] += value
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        counters = defaultdict(float)
+        histograms = {}
+        # Copying a dict is atomic, so shards can be read while updated
+        for shard_counters, shard_histograms in list(self._shards.values()):
+            for key, value in dict(shard_counters).items():
+                counters[key] += value
+            for key, values in dict(shard_histograms).items():
+                total = histograms.setdefault(key, [0] * len(values))
+                for index, value in enumerate(list(values)):
+                    total[index] += value
+
+        lines = []
+        for name, (help_text, metric_type) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == "counter":
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric == name:
+                    lines.extend(self._histogram_lines(name, labels, values))
+        return "\n".join(lines) + "\n"
+
+    def _histogram_lines(self, name: str, labels: Labels, values: List) -> List[str]:
+        """Render the cumulative buckets, sum and count of a histogram."""
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), values[:-1]):
+            cumulative += count
+            le = bound if bound == "+Inf" else _number(bound)
+            bucket_labels = _labels((*labels, ("le", le)))
+            lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_number(values[-1])}")
+        lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return lines
+
+
+def _labels(labels: Labels) -> str:
+    """Format label pairs as `{name="value",...}`."""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Format a sample value, without a fraction for whole numbers."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,521 @@
+# src/flask_api_sqlalchemy/query.py
+# Query-building helpers shared by the generated endpoints
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import operator
+import uuid
+from typing import Any, Container, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    PrimaryKeyConstraint,
+    UniqueConstraint,
+    and_,
+    false,
+    inspect,
+    or_,
+    tuple_,
+)
+from sqlalchemy.sql.elements import ColumnElement
+
+from .exceptions import QueryError
+
+# Comparison operators accepted as `<column>__<op>=<value>` query parameters
+FILTER_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "in": lambda column, values: column.in_(values),
+    "like": lambda column, value: column.like(value),
+    "ilike": lambda column, value: column.ilike(value),
+    "isnull": lambda column, value: column.is_(None) if value else column.is_not(None),
+}
+
+# Python types whose columns can be compared against query parameter values
+FILTERABLE_TYPES = (
+    str,
+    int,
+    float,
+    bool,
+    decimal.Decimal,
+    uuid.UUID,
+    datetime.date,
+    datetime.datetime,
+    datetime.time,
+)
+
+TRUE_VALUES = {"true", "1", "yes", "on"}
+FALSE_VALUES = {"false", "0", "no", "off"}
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row on a page as an opaque cursor.
+
+    Args:
+        values (Sequence[Any]): Values of the ordering columns, in order
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor string received from the client
+        size (int): Number of ordering columns the cursor must carry
+
+    Returns:
+        List[Any]: Values of the ordering columns
+
+    Raises:
+        QueryError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise QueryError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise QueryError("Invalid cursor")
+
+    return values
+
+
+def keyset_predicate(
+    order_by: Sequence[Tuple[Any, bool]], values: Sequence[Any]
+) -> ColumnElement:
+    """Build the WHERE clause that resumes an ordered scan after `values`.
+
+    Unlike OFFSET, the clause lets the database seek straight to the next row
+    through the index on the ordering columns, so every page costs the same.
+
+    NULLs sort after every value, as `order_clauses` orders them, and are
+    compared with `IS NULL` since `(a, b) > (NULL, 4)` is never true.
+
+    Args:
+        order_by (Sequence[Tuple[Any, bool]]): (column, descending) pairs
+        values (Sequence[Any]): Values of those columns on the last row seen
+
+    Returns:
+        ColumnElement: Boolean clause selecting the rows after `values`
+    """
+    columns = [column for column, _ in order_by]
+    directions = {descending for _, descending in order_by}
+    nullable = any(_nullable(column) for column in columns)
+
+    # A single direction can use a row-value comparison, which both
+    # PostgreSQL and SQLite turn into one index range scan
+    if len(directions) == 1 and not nullable:
+        descending = directions.pop()
+        if len(columns) == 1:
+            left, right = columns[0], values[0]
+        else:
+            left, right = tuple_(*columns), tuple_(*values)
+        return left < right if descending else left > right
+
+    # Mixed directions and nullable columns need the expanded form:
+    # (a > x) OR (a = x AND b < y) OR ...
+    clauses = []
+    for index, (column, descending) in enumerate(order_by):
+        equal = [_equal(columns[i], values[i]) for i in range(index)]
+        clauses.append(and_(*equal, _after(column, values[index], descending)))
+    return or_(*clauses)
+
+
+def _nullable(column: Any) -> bool:
+    """Tell whether an ordering column may hold NULLs."""
+    return bool(getattr(getattr(column, "expression", column), "nullable", False))
+
+
+def _equal(column: Any, value: Any) -> ColumnElement:
+    """Build `column = value`, true for NULL = NULL."""
+    return column.is_(None) if value is None else column == value
+
+
+def _after(column: Any, value: Any, descending: bool) -> ColumnElement:
+    """Build the clause selecting the values sorted after `value`.
+
+    Args:
+        column (Any): Ordering column
+        value (Any): Value on the last row seen
+        descending (bool): Whether the column sorts in descending order
+
+    Returns:
+        ColumnElement: Boolean clause, NULLs being greater than any value
+    """
+    if value is None:
+        # Ascending, nothing follows NULL; descending, every value does
+        return column.is_not(None) if descending else false()
+    if descending:
+        return column < value
+    if _nullable(column):
+        return or_(column > value, column.is_(None))
+    return column > value
+
+
+def parse_bool(value: Any) -> bool:
+    """Parse a boolean query parameter value.
+
+    Args:
+        value (Any): Raw value such as "true" or "0", or a JSON boolean
+
+    Returns:
+        bool: Parsed value
+
+    Raises:
+        ValueError: If the value is not a recognised boolean
+    """
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise ValueError(f"not a boolean: {value}")
+
+
+class QueryBuilder:
+    """Compile filter and sort query parameters into SQL for one model.
+
+    The builder is created once per model from its mapped columns, so each
+    request only looks up names and coerces values.
+    """
+
+    def __init__(self, model: Any, require_index: bool = False) -> None:
+        """Inspect the model's columns.
+
+        Args:
+            model (Any): SQLAlchemy model class
+            require_index (bool): Reject filters and sorts on columns that no
+                database index can serve
+        """
+        mapper = inspect(model)
+        self.model = model
+        self.require_index = require_index
+        self.columns = {}  # Column name -> table column
+        self.attributes = {}  # Column name -> instrumented attribute
+        self.column_names = {}  # Attribute key -> column name
+        self.python_types = {}  # Column name -> Python type of its values
+
+        for column in mapper.columns:
+            key = mapper.get_property_by_column(column).key
+            self.columns[column.name] = column
+            self.attributes[column.name] = getattr(model, key)
+            self.column_names[key] = column.name
+            try:
+                self.python_types[column.name] = column.type.python_type
+            except NotImplementedError:
+                self.python_types[column.name] = str
+
+        self.indexed = self._indexed_columns(mapper)
+        self.primary_key = [
+            (self.attributes[column.name], False) for column in mapper.primary_key
+        ]
+        self.key_columns = list(mapper.primary_key)
+        self.key_names = [column.name for column in mapper.primary_key]
+
+    @staticmethod
+    def _indexed_columns(mapper: Any) -> set:
+        """Find the columns that lead an index, unique constraint or primary key.
+
+        Args:
+            mapper (Any): SQLAlchemy mapper of the model
+
+        Returns:
+            set: Names of columns an index can seek on
+        """
+        indexed = set()
+        for column in mapper.columns:
+            if column.primary_key or column.index or column.unique:
+                indexed.add(column.name)
+
+        for table in mapper.tables:
+            constraints = [
+                constraint
+                for constraint in table.constraints
+                if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint))
+            ]
+            for index in list(table.indexes) + constraints:
+                columns = list(index.columns)
+                if columns:
+                    indexed.add(columns[0].name)
+        return indexed
+
+    def _column(self, name: str, purpose: str) -> Any:
+        """Look up a column attribute a client wants to filter or sort on.
+
+        Args:
+            name (str): Column name
+            purpose (str): "filter" or "sort", for error messages
+
+        Returns:
+            Any: Instrumented attribute of the column
+        """
+        if name not in self.attributes:
+            raise QueryError(f"Cannot {purpose} on unknown field '{name}'")
+        if self.require_index and name not in self.indexed:
+            raise QueryError(f"Cannot {purpose} on non-indexed field '{name}'")
+        return self.attributes[name]
+
+    def coerce(self, name: str, value: Any) -> Any:
+        """Convert a query parameter or cursor value to the column's type.
+
+        Args:
+            name (str): Column name
+            value (Any): Raw value, usually a string
+
+        Returns:
+            Any: Value of the column's Python type
+        """
+        python_type = self.python_types[name]
+        if not isinstance(value, str) or python_type is str:
+            return value
+
+        try:
+            if python_type is bool:
+                return parse_bool(value)
+            if python_type in (datetime.date, datetime.datetime, datetime.time):
+                return python_type.fromisoformat(value)
+            return python_type(value)
+        except (TypeError, ValueError, decimal.InvalidOperation):
+            raise QueryError(f"Invalid value for '{name}': {value}")
+
+    def coerce_payload(self, name: str, value: Any) -> Any:
+        """Convert a value of a write payload to the column's type.
+
+        Only scalar columns, those that filters accept, are converted. JSON,
+        ARRAY and binary columns take payload values as they are, as creates
+        do.
+
+        Args:
+            name (str): Column name
+            value (Any): Value from the JSON payload
+
+        Returns:
+            Any: Value to write
+        """
+        if not issubclass(self.python_types[name], FILTERABLE_TYPES):
+            return value
+        return self.coerce(name, value)
+
+    def coerce_identity(self, value: Any) -> Any:
+        """Convert a client-supplied identifier to the primary key's types.
+
+        Args:
+            value (Any): Key value, or a list of values for a composite key
+
+        Returns:
+            Any: Key value, or a tuple for a composite key, as `Session.get`
+                takes it
+        """
+        if len(self.key_names) == 1:
+            return self.coerce(self.key_names[0], value)
+        if not isinstance(value, (list, tuple)) or len(value) != len(self.key_names):
+            raise QueryError(
+                f"Identifiers must be lists of {', '.join(self.key_names)}"
+            )
+        return tuple(
+            self.coerce(name, item) for name, item in zip(self.key_names, value)
+        )
+
+    def identity_clause(self, identity: Any) -> ColumnElement:
+        """Build the WHERE clause selecting one row by primary key.
+
+        Args:
+            identity (Any): Value from `coerce_identity`
+
+        Returns:
+            ColumnElement: Clause on the primary key columns
+        """
+        if len(self.key_columns) == 1:
+            return self.key_columns[0] == identity
+        return and_(
+            *(column == value for column, value in zip(self.key_columns, identity))
+        )
+
+    def identities_clause(self, identities: Sequence[Any]) -> ColumnElement:
+        """Build a `WHERE pk IN (...)` clause for several identifiers.
+
+        Args:
+            identities (Sequence[Any]): Values from `coerce_identity`
+
+        Returns:
+            ColumnElement: Clause on the primary key columns
+        """
+        if len(self.key_columns) == 1:
+            return self.key_columns[0].in_(identities)
+        return tuple_(*self.key_columns).in_(identities)
+
+    def row_identity(self, row: Any, mapping: bool = False) -> Any:
+        """Read the identifier of a row, shaped like `coerce_identity` output.
+
+        Args:
+            row (Any): ORM object, or `RowMapping` when `mapping` is true
+            mapping (bool): Whether `row` is keyed by column name
+
+        Returns:
+            Any: Key value, or a tuple for a composite key
+        """
+        values = self.row_values(row, self.primary_key, mapping)
+        return values[0] if len(values) == 1 else tuple(values)
+
+    def filters(
+        self,
+        args: Iterable[Tuple[str, Any]],
+        reserved: Container[str] = (),
+        strict: bool = False,
+    ) -> List[ColumnElement]:
+        """Compile `<column>__<op>=<value>` parameters into WHERE clauses.
+
+        A bare `<column>=<value>` means equality. Parameters that name neither
+        a column nor an operator (and any in `reserved`) are left alone, unless
+        `strict` is set. Values may also be JSON values, with a list for `in`.
+
+        Args:
+            args (Iterable[Tuple[str, Any]]): (name, value) pairs
+            reserved (Container[str]): Parameter names used for other purposes
+            strict (bool): Reject names that are not filters
+
+        Returns:
+            List[ColumnElement]: Clauses to AND together
+        """
+        clauses = []
+        for key, value in args:
+            if key in reserved:
+                continue
+
+            name, separator, op = key.rpartition("__")
+            if not separator or op not in FILTER_OPERATORS:
+                if key not in self.attributes:
+                    if separator or strict:
+                        raise QueryError(f"Unknown filter '{key}'")
+                    continue
+                name, op = key, "eq"
+
+            column = self._column(name, "filter")
+            if not issubclass(self.python_types[name], FILTERABLE_TYPES):
+                raise QueryError(f"Cannot filter on field '{name}'")
+
+            if op == "isnull":
+                try:
+                    operand = parse_bool(value)
+                except ValueError:
+                    raise QueryError(f"Invalid value for '{key}': {value}")
+            elif op == "in":
+                items = value if isinstance(value, list) else value.split(",")
+                operand = [self.coerce(name, item) for item in items]
+            else:
+                operand = self.coerce(name, value)
+
+            clauses.append(FILTER_OPERATORS[op](column, operand))
+        return clauses
+
+    def order_by(self, sort: Optional[str]) -> List[Tuple[Any, bool]]:
+        """Compile a `sort=-created,name` parameter into ordering keys.
+
+        The primary key is appended as a tie-breaker, so the order is total and
+        can be resumed from a keyset cursor.
+
+        Args:
+            sort (Optional[str]): Comma-separated names, "-" for descending
+
+        Returns:
+            List[Tuple[Any, bool]]: (attribute, descending) pairs
+        """
+        order_by = []
+        for name in (sort or "").split(","):
+            name = name.strip()
+            if not name:
+                continue
+            descending = name.startswith("-")
+            order_by.append((self._column(name.lstrip("-"), "sort"), descending))
+
+        sorted_attributes = {attribute.key for attribute, _ in order_by}
+        for attribute, descending in self.primary_key:
+            if attribute.key not in sorted_attributes:
+                order_by.append((attribute, descending))
+        return order_by
+
+    def cursor_values(
+        self, order_by: Sequence[Tuple[Any, bool]], cursor: str
+    ) -> List[Any]:
+        """Decode a keyset cursor into values typed like the ordering columns.
+
+        Args:
+            order_by (Sequence[Tuple[Any, bool]]): Ordering keys of the listing
+            cursor (str): Cursor received from the client
+
+        Returns:
+            List[Any]: Values to resume the scan after
+        """
+        values = decode_cursor(cursor, len(order_by))
+        return [
+            self.coerce(self.column_names[attribute.key], value)
+            for (attribute, _), value in zip(order_by, values)
+        ]
+
+    def select_columns(
+        self, names: Iterable[str], order_by: Sequence[Tuple[Any, bool]] = ()
+    ) -> List[Any]:
+        """List the table columns a Core SELECT needs.
+
+        Args:
+            names (Iterable[str]): Column names the response will include
+            order_by (Sequence[Tuple[Any, bool]]): Ordering keys a keyset
+                cursor will be built from
+
+        Returns:
+            List[Any]: Table columns, in mapper order
+        """
+        wanted = set(names)
+        wanted.update(self.column_names[attribute.key] for attribute, _ in order_by)
+        return [column for name, column in self.columns.items() if name in wanted]
+
+    def row_values(
+        self, row: Any, order_by: Sequence[Tuple[Any, bool]], mapping: bool = False
+    ) -> List[Any]:
+        """Read the ordering key values of a row, for a keyset cursor.
+
+        Args:
+            row (Any): ORM object, or `RowMapping` when `mapping` is true
+            order_by (Sequence[Tuple[Any, bool]]): Ordering keys
+            mapping (bool): Whether `row` is keyed by column name
+
+        Returns:
+            List[Any]: Values of the ordering columns
+        """
+        if mapping:
+            return [row[self.column_names[attribute.key]] for attribute, _ in order_by]
+        return [getattr(row, attribute.key) for attribute, _ in order_by]
+
+
+def order_clauses(order_by: Sequence[Tuple[Any, bool]]) -> List[Any]:
+    """Turn (column, descending) pairs into ORDER BY clauses.
+
+    NULLs of nullable columns sort as the greatest values on every database
+    (SQLite puts them first by default), to match `keyset_predicate`.
+
+    Args:
+        order_by (Sequence[Tuple[Any, bool]]): Ordering keys
+
+    Returns:
+        List[Any]: Clauses for `Select.order_by`
+    """
+    clauses = []
+    for column, descending in order_by:
+        clause = column.desc() if descending else column.asc()
+        if _nullable(column):
+            clause = clause.nulls_first() if descending else clause.nulls_last()
+        clauses.append(clause)
+    return clauses
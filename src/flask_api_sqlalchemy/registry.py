@@ -0,0 +1,261 @@
+# src/flask_api_sqlalchemy/registry.py
+# Registry of the SQLAlchemy models an API is generated for
+import logging
+import os
+import pickle
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional
+
+import inflection
+from sqlalchemy import MetaData
+from sqlalchemy.orm import registry as mapper_registry
+
+from .exceptions import ModelDiscoveryError
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """Mapped classes to generate endpoints for, by model name.
+
+    Discovery walks every mapper of a declarative base's registry, so it
+    finds models behind abstract bases, mixins and inheritance, not only the
+    base's direct subclasses. Discover once and pass the registry to every
+    `Api` (or app factory call) in the process to avoid walking it again.
+
+    Registries pickle by reference to their model classes, so models must be
+    importable at module level to be pickled. Reflected registries pickle
+    their tables instead, and map them again when unpickled.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, Any],
+        config: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """Create a registry from known models.
+
+        Args:
+            models (Dict[str, Any]): Mapped classes, by model name
+            config (Optional[Dict[str, Dict[str, Any]]]): Per-model options,
+                by model name
+        """
+        self.models = models
+        self.config = config or {}
+        self.metadata = None  # Reflected tables, for reflected registries
+        self._options = {}  # Arguments of `from_metadata`
+
+    @classmethod
+    def discover(
+        cls,
+        base: Any,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        config: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> "ModelRegistry":
+        """Find the mapped classes of a declarative base.
+
+        Args:
+            base (Any): Declarative base, such as `db.Model`
+            include (Optional[Iterable[str]]): Glob patterns of the model names
+                to keep (default: all)
+            exclude (Optional[Iterable[str]]): Glob patterns of the model names
+                to skip
+            config (Optional[Dict[str, Dict[str, Any]]]): Per-model options,
+                keyed by class name or `module.QualifiedName`. The `name`
+                option exposes a model under another name, which resolves
+                classes with the same name in different modules.
+
+        Returns:
+            ModelRegistry: Registry of the matching models, sorted by name
+
+        Raises:
+            ModelDiscoveryError: If two matching models end up with one name
+        """
+        config = config or {}
+        models = {}
+        options = {}
+        paths = {}
+        for mapper in base.registry.mappers:
+            model = mapper.class_
+            path = f"{model.__module__}.{model.__qualname__}"
+            model_config = config.get(path, config.get(model.__name__, {}))
+            name = model_config.get("name", model.__name__)
+            if _selected(name, include, exclude):
+                _check_unique(name, path, paths)
+                models[name] = model
+                options[name] = model_config
+
+        return cls(
+            {name: models[name] for name in sorted(models)},
+            {name: options[name] for name in sorted(options)},
+        )
+
+    @classmethod
+    def reflect(
+        cls,
+        engine: Any,
+        schema: Optional[str] = None,
+        tables: Optional[List[str]] = None,
+        cache_file: Optional[str] = None,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        config: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> "ModelRegistry":
+        """Reflect the tables of a database into a registry.
+
+        Introspecting a large catalog is slow, so the reflected `MetaData` can
+        be cached in a file and read back on the next start. The file is only
+        reused for the same `schema` and `tables`; delete it after changing
+        the database schema.
+
+        Args:
+            engine (Any): SQLAlchemy engine of the database
+            schema (Optional[str]): Schema to reflect (default: the default one)
+            tables (Optional[List[str]]): Names of the tables to reflect
+                (default: all)
+            cache_file (Optional[str]): File caching the reflected tables
+            include (Optional[Iterable[str]]): Glob patterns of the model names
+                to keep (default: all)
+            exclude (Optional[Iterable[str]]): Glob patterns of the model names
+                to skip
+            config (Optional[Dict[str, Dict[str, Any]]]): Per-model options,
+                keyed by model name or table name (`schema.table` if given)
+
+        Returns:
+            ModelRegistry: Registry of the tables, mapped to new classes
+        """
+        key = {"schema": schema, "tables": sorted(tables) if tables else None}
+        metadata = None
+        if cache_file and os.path.exists(cache_file):
+            with open(cache_file, "rb") as f:
+                cached = pickle.load(f)
+            if cached["key"] == key:
+                metadata = cached["metadata"]
+
+        if metadata is None:
+            metadata = MetaData()
+            metadata.reflect(bind=engine, schema=schema, only=tables)
+            if cache_file:
+                with open(cache_file, "wb") as f:
+                    pickle.dump({"key": key, "metadata": metadata}, f)
+
+        return cls.from_metadata(metadata, include, exclude, config)
+
+    @classmethod
+    def from_metadata(
+        cls,
+        metadata: MetaData,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        config: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> "ModelRegistry":
+        """Map tables without declared models to new classes.
+
+        Each table gets a class named after it (`order_items` becomes
+        `OrderItem`), mapped imperatively. Tables without a primary key
+        cannot be mapped and are skipped.
+
+        Args:
+            metadata (MetaData): Tables to map
+            include (Optional[Iterable[str]]): Glob patterns of the model names
+                to keep (default: all)
+            exclude (Optional[Iterable[str]]): Glob patterns of the model names
+                to skip
+            config (Optional[Dict[str, Dict[str, Any]]]): Per-model options,
+                keyed by model name or table name (`schema.table` if given)
+
+        Returns:
+            ModelRegistry: Registry of the mapped classes
+        """
+        config = config or {}
+        mappers = mapper_registry(metadata=metadata)
+        models = {}
+        options = {}
+        paths = {}
+        for table in metadata.sorted_tables:
+            if not table.primary_key.columns:
+                logger.warning(f"Skipping table {table.fullname} without primary key")
+                continue
+            default_name = inflection.camelize(inflection.singularize(table.name))
+            model_config = config.get(table.fullname, config.get(default_name, {}))
+            name = model_config.get("name", default_name)
+            if _selected(name, include, exclude):
+                _check_unique(name, table.fullname, paths)
+                model = type(name, (), {"__doc__": f"Reflected {table.fullname}"})
+                mappers.map_imperatively(model, table)
+                models[name] = model
+                options[name] = model_config
+
+        registry = cls(
+            {name: models[name] for name in sorted(models)},
+            {name: options[name] for name in sorted(options)},
+        )
+        registry.metadata = metadata
+        registry._options = {"include": include, "exclude": exclude, "config": config}
+        return registry
+
+    def __reduce__(self) -> tuple:
+        # Reflected classes cannot be imported, so map them again
+        if self.metadata is not None:
+            return (
+                _from_metadata,
+                (self.metadata, self._options),
+            )
+        return super().__reduce__()
+
+    def option(self, model_name: str, key: str, default: Any = None) -> Any:
+        """Get a per-model option.
+
+        Args:
+            model_name (str): Name of the model
+            key (str): Option name
+            default (Any): Value when the model does not set the option
+
+        Returns:
+            Any: Option value
+        """
+        return self.config.get(model_name, {}).get(key, default)
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def __contains__(self, model_name: str) -> bool:
+        return model_name in self.models
+
+
+def _from_metadata(metadata: MetaData, options: Dict[str, Any]) -> ModelRegistry:
+    """Unpickle a reflected registry."""
+    return ModelRegistry.from_metadata(metadata, **options)
+
+
+def _selected(
+    name: str, include: Optional[Iterable[str]], exclude: Optional[Iterable[str]]
+) -> bool:
+    """Tell whether a model name passes the include and exclude patterns."""
+    if name == "Base" or name.startswith("_"):
+        return False
+    if include is not None and not any(
+        fnmatchcase(name, pattern) for pattern in include
+    ):
+        return False
+    return not any(fnmatchcase(name, pattern) for pattern in exclude or ())
+
+
+def _check_unique(name: str, path: str, paths: Dict[str, str]) -> None:
+    """Record the source of a model name, rejecting a second one.
+
+    Args:
+        name (str): Model name
+        path (str): Class path or table name the model comes from
+        paths (Dict[str, str]): Sources recorded so far, by model name
+
+    Raises:
+        ModelDiscoveryError: If another model already has the name
+    """
+    if name in paths:
+        raise ModelDiscoveryError(
+            f"Models {paths[name]} and {path} are both named {name}; "
+            f"rename one with config={{'{path}': {{'name': ...}}}}"
+        )
+    paths[name] = path
@@ -1,11 +1,14 @@
 # tests/conftest.py
 # Test configuration and fixtures
-from typing import Any, Dict, Generator
+import uuid
+from itertools import count
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional
 
 import pytest
 from flask import Flask
 from flask.testing import FlaskClient
 from flask_api_sqlalchemy import Api
+from flask_api_sqlalchemy.registry import ModelRegistry
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import (
     JSON,
@@ -14,6 +17,7 @@ from sqlalchemy import (
     Boolean,
     Column,
     Date,
+    DateTime,
     Float,
     ForeignKey,
     Integer,
@@ -24,6 +28,7 @@ from sqlalchemy import (
     String,
     Text,
     Time,
+    func,
 )
 from sqlalchemy.dialects.postgresql import (
     ARRAY,
@@ -82,6 +87,37 @@ class Item(Base):
     user = relationship("User", backref="items")
 
 
+class Document(Base):
+    """Model whose rows carry an update timestamp, for conditional requests."""
+
+    __tablename__ = "document"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(100), nullable=False)
+    updated_at = Column(
+        DateTime, nullable=False, default=func.now(), onupdate=func.now()
+    )
+
+
+class Tag(Base):
+    """Model keyed by a UUID."""
+
+    __tablename__ = "tag"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(50), nullable=False)
+
+
+class Membership(Base):
+    """Model with a composite primary key."""
+
+    __tablename__ = "membership"
+
+    user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    role = Column(String(20), primary_key=True)
+    note = Column(Text, nullable=True)
+
+
 class AllTypes(Base):
     """Model with all PostgreSQL data types for testing."""
 
@@ -404,3 +440,99 @@ def api(app: Flask, db: Generator[SQLAlchemy, None, None]) -> Api:
     api = Api()
     api.init_app(app, db)
     return api
+
+
+@pytest.fixture
+def make_api(app: Flask, db: SQLAlchemy) -> Callable[..., Api]:
+    """Create API instances with custom options.
+
+    Args:
+        app (Flask): Flask application fixture
+        db (SQLAlchemy): SQLAlchemy instance
+
+    Returns:
+        Callable[..., Api]: Factory taking `Api` keyword arguments
+    """
+
+    def _make_api(**options: Any) -> Api:
+        api = Api(**options)
+        api.init_app(app, db)
+        return api
+
+    return _make_api
+
+
+@pytest.fixture
+def file_app(tmp_path) -> Callable[..., Flask]:
+    """Create applications on SQLite files of their own, apart from `db`.
+
+    Each call gets new files, one per engine: the default one and one per
+    key of `binds`.
+
+    Args:
+        tmp_path: Directory of the database files
+
+    Returns:
+        Callable[..., Flask]: Factory taking the declarative base, `include`
+            and `config` for `ModelRegistry.discover`, `binds`, a `seed`
+            function called with the database once the tables exist, and
+            further `Api` keyword arguments
+    """
+    calls = count()
+
+    def _file_app(
+        base: Any = Base,
+        include: Optional[List[str]] = None,
+        config: Optional[Dict[str, Dict[str, Any]]] = None,
+        binds: Iterable[str] = (),
+        seed: Optional[Callable[[SQLAlchemy], None]] = None,
+        **options: Any,
+    ) -> Flask:
+        name = f"app{next(calls)}"
+        app = Flask(__name__)
+        app.config["TESTING"] = True
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / name}.db"
+        app.config["SQLALCHEMY_BINDS"] = {
+            key: f"sqlite:///{tmp_path / name}-{key}.db" for key in binds
+        }
+        db = SQLAlchemy(app)
+        registry = ModelRegistry.discover(base, include=include, config=config)
+        tables = list({model.__table__: None for model in registry.models.values()})
+
+        with app.app_context():
+            for engine in db.engines.values():
+                base.metadata.create_all(engine, tables=tables)
+            if seed is not None:
+                seed(db)
+            Api(registry=registry, **options).init_app(app, db)
+        return app
+
+    return _file_app
+
+
+@pytest.fixture
+def document(db: SQLAlchemy) -> Document:
+    """Create a document, creating its table if needed.
+
+    Args:
+        db (SQLAlchemy): SQLAlchemy instance
+
+    Returns:
+        Document: Created document
+    """
+    Document.__table__.create(db.engine, checkfirst=True)
+    document = Document(title="Quarterly report")
+    db.session.add(document)
+    db.session.commit()
+    return document
+
+
+@pytest.fixture
+def keyed_tables(db: SQLAlchemy) -> None:
+    """Create the tables of the models with non-integer and composite keys.
+
+    Args:
+        db (SQLAlchemy): SQLAlchemy instance
+    """
+    for model in (Tag, Membership):
+        model.__table__.create(db.engine, checkfirst=True)
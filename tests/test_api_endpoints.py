@@ -1,13 +1,21 @@
 # tests/test_api_endpoints.py
 # Tests for the API endpoints
+import json
 import random
 import string
+import uuid
 from http import HTTPStatus
+from typing import Callable
 
+import pytest
+from flask import Flask
 from flask.testing import FlaskClient
 from flask_restx import Api
 from flask_sqlalchemy import SQLAlchemy
-from tests.conftest import User
+from sqlalchemy import event, text
+from flask_api_sqlalchemy import Api as FlaskApiSqlalchemy
+from flask_api_sqlalchemy.registry import ModelRegistry
+from tests.conftest import AllTypes, Base, Item, User
 
 
 def test_database_content(db):
@@ -234,3 +242,729 @@ def test_create_item(client, api: Api, db: SQLAlchemy):
     assert response.status_code == 201
     assert response.json["name"] == payload["name"]
     assert response.json["user_id"] == new_user.id
+
+
+def test_get_users_keyset_pagination(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test walking the users collection page by page with cursors."""
+    make_api(paginate=True, page_size=2)
+
+    # Make sure there are several pages to walk
+    for _ in range(5):
+        username = "".join(random.choice(string.ascii_letters) for _ in range(10))
+        db.session.add(User(username=username, email=f"{username}@notarealco.com"))
+    db.session.commit()
+
+    ids = []
+    cursor = None
+    while True:
+        query = {"cursor": cursor} if cursor else {}
+        response = client.get("/api/users/", query_string=query)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json["items"]) <= 2
+        ids.extend(user["id"] for user in response.json["items"])
+        cursor = response.json["next"]
+        if cursor is None:
+            break
+
+    # Every user is returned exactly once, in primary key order
+    assert ids == sorted(ids)
+    assert len(ids) == len(set(ids)) == db.session.query(User).count()
+
+    # The limit parameter overrides the default page size
+    response = client.get("/api/users/", query_string={"limit": 3})
+    assert len(response.json["items"]) == 3
+
+
+def test_keyset_pagination_nullable_sort(
+    client: FlaskClient,
+    make_api: Callable[..., Api],
+    db: SQLAlchemy,
+):
+    """Test that cursors walk past rows whose sort column is NULL."""
+    make_api(paginate=True, page_size=2)
+    username = "".join(random.choice(string.ascii_letters) for _ in range(10))
+    user = User(username=username, email=f"{username}@notarealco.com")
+    for index in range(6):
+        description = None if index % 2 else f"description {index}"
+        db.session.add(Item(name=f"item {index}", description=description, user=user))
+    db.session.commit()
+    expected = {item.id for item in db.session.query(Item)}
+
+    for sort in ("description", "-description"):
+        ids, descriptions = [], []
+        cursor = None
+        while True:
+            query = {"sort": sort, "limit": 2}
+            if cursor:
+                query["cursor"] = cursor
+            response = client.get("/api/items/", query_string=query)
+            assert response.status_code == HTTPStatus.OK
+            ids.extend(item["id"] for item in response.json["items"])
+            descriptions.extend(item["description"] for item in response.json["items"])
+            cursor = response.json["next"]
+            if cursor is None:
+                break
+
+        assert len(ids) == len(set(ids)) and set(ids) == expected
+        # NULLs sort as the greatest values
+        nulls = [description is None for description in descriptions]
+        assert nulls == sorted(nulls, reverse=sort.startswith("-"))
+
+
+def test_get_users_invalid_cursor(client: FlaskClient, make_api: Callable[..., Api]):
+    """Test that a malformed cursor is rejected."""
+    make_api(paginate=True)
+
+    response = client.get("/api/users/", query_string={"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    response = client.get("/api/users/", query_string={"limit": 0})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_stream_users(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test streaming the users collection as NDJSON and as a JSON array."""
+    api = make_api(streaming=True, stream_batch_size=2)
+    user_count = db.session.query(User).count()
+
+    # NDJSON is selected through the Accept header
+    response = client.get("/api/users/", headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == user_count
+    assert all("id" in json.loads(line) for line in lines)
+
+    # The JSON array stream parses to the same rows as a regular listing
+    response = client.get("/api/users/", query_string={"stream": "json"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.is_streamed
+    assert json.loads(response.get_data()) == client.get("/api/users/").json
+
+    # The swagger spec still renders with the streaming parameters
+    with client.application.test_request_context():
+        specs_url = api.api.specs_url
+    assert client.get(specs_url).status_code == HTTPStatus.OK
+
+
+def test_get_users_with_fields(client: FlaskClient, api: Api, db: SQLAlchemy):
+    """Test narrowing listings and items to the requested fields."""
+    response = client.get("/api/users/", query_string={"fields": "id,username"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json
+    assert all(set(user) == {"id", "username"} for user in response.json)
+
+    user_id = response.json[0]["id"]
+    response = client.get(f"/api/users/{user_id}", query_string={"fields": "email"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {"email": db.session.get(User, user_id).email}
+
+    # Unknown fields are rejected rather than silently ignored
+    response = client.get("/api/users/", query_string={"fields": "id,password"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_filter_and_sort_users(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test filtering and sorting the users collection."""
+    make_api(paginate=True, page_size=2)
+
+    prefix = "".join(random.choice(string.ascii_lowercase) for _ in range(8))
+    for index in range(3):
+        db.session.add(
+            User(
+                username=f"{prefix}{index}",
+                email=f"{prefix}{index}@notarealco.com",
+                is_active=index != 1,
+            )
+        )
+    db.session.commit()
+
+    # Filters are ANDed together and sorting can descend
+    response = client.get(
+        "/api/users/",
+        query_string={"username__like": f"{prefix}%", "sort": "-username"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    usernames = [user["username"] for user in response.json["items"]]
+    assert usernames == [f"{prefix}2", f"{prefix}1"]
+
+    # The cursor resumes the same descending order
+    response = client.get(
+        "/api/users/",
+        query_string={
+            "username__like": f"{prefix}%",
+            "sort": "-username",
+            "cursor": response.json["next"],
+        },
+    )
+    assert [user["username"] for user in response.json["items"]] == [f"{prefix}0"]
+    assert response.json["next"] is None
+
+    # A bare field name means equality, with values coerced to the column type
+    response = client.get(
+        "/api/users/",
+        query_string={"username__in": f"{prefix}0,{prefix}1", "is_active": "false"},
+    )
+    assert [user["username"] for user in response.json["items"]] == [f"{prefix}1"]
+
+    # Unknown operators and badly typed values are rejected
+    response = client.get("/api/users/", query_string={"username__near": "x"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    response = client.get("/api/users/", query_string={"id__gt": "abc"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    response = client.get("/api/users/", query_string={"sort": "password"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_filter_invalid_values(client: FlaskClient, api: Api):
+    """Test that filter values a column cannot hold are rejected."""
+    for query in ({"numeric_col__gt": "x"}, {"integer_col": "x"}):
+        response = client.get("/api/alltypes/", query_string=query)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, query
+
+
+@pytest.mark.parametrize("fast_writes", [False, True])
+def test_update_value_types(
+    client: FlaskClient,
+    make_api: Callable[..., Api],
+    db: SQLAlchemy,
+    fast_writes: bool,
+):
+    """Test that updates parse scalars only and reject what they cannot parse."""
+    make_api(fast_writes=fast_writes)
+    row = db.session.query(AllTypes).first()
+    row.bytea_col = row.binary_col = None  # Binary values do not render as JSON
+    db.session.commit()
+    url = f"/api/alltypes/{row.id}"
+
+    response = client.put(
+        url,
+        json={
+            "json_col": "plain string",
+            "text_array_col": ["abc"],
+            "integer_col": "7",
+            "numeric_col": "1.50",
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["json_col"] == "plain string"
+    assert response.json["text_array_col"] == ["abc"]
+    assert response.json["integer_col"] == 7
+    assert response.json["numeric_col"] == 1.5
+
+    response = client.patch(
+        "/api/alltypes/",
+        json={"filter": {"id__gte": 0}, "values": {"jsonb_col": "text"}},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    for field in ("numeric_col", "double_col", "integer_col"):
+        response = client.put(url, json={field: "abc"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, field
+
+
+def test_filter_requires_index(client: FlaskClient, make_api: Callable[..., Api]):
+    """Test rejecting filters and sorts that no index can serve."""
+    make_api(require_indexed_filters=True)
+
+    # username is unique, so it is backed by an index
+    response = client.get("/api/users/", query_string={"username": "nobody"})
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.get("/api/users/", query_string={"is_active": "true"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    response = client.get("/api/users/", query_string={"sort": "is_active"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_count_modes(client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy):
+    """Test X-Total-Count with exact, estimated and disabled counting."""
+    make_api(
+        paginate=True, page_size=1, count_mode="exact", count_modes={"Item": "none"}
+    )
+    total = db.session.query(User).count()
+
+    response = client.get("/api/users/")
+    assert len(response.json["items"]) == 1
+    assert response.headers["X-Total-Count"] == str(total)
+
+    # Filters apply to the total, the cursor does not
+    username = db.session.query(User).first().username
+    response = client.get("/api/users/", query_string={"username": username})
+    assert response.headers["X-Total-Count"] == "1"
+    response = client.get("/api/users/", query_string={"cursor": response.json["next"]})
+    assert response.headers["X-Total-Count"] == str(total)
+
+    # Clients may pick a cheaper mode
+    db.session.execute(text('ANALYZE "user"'))
+    db.session.commit()
+    response = client.get("/api/users/", query_string={"count": "estimated"})
+    assert int(response.headers["X-Total-Count"]) >= 0
+    response = client.get(
+        "/api/users/", query_string={"count": "estimated", "username": username}
+    )
+    assert int(response.headers["X-Total-Count"]) >= 0
+    response = client.get("/api/users/", query_string={"count": "none"})
+    assert "X-Total-Count" not in response.headers
+
+    # ...but never a costlier one than the model's
+    response = client.get("/api/items/", query_string={"count": "exact"})
+    assert response.status_code == HTTPStatus.OK
+    assert "X-Total-Count" not in response.headers
+    response = client.get("/api/items/", query_string={"count": "all"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_unknown_count_modes(app: Flask, db: SQLAlchemy):
+    """Test that misspelled count modes are rejected up front."""
+    with pytest.raises(ValueError, match="exakt"):
+        FlaskApiSqlalchemy(count_mode="exakt")
+    with pytest.raises(ValueError, match="exakt"):
+        FlaskApiSqlalchemy(count_modes={"User": "exakt"})
+
+    registry = ModelRegistry.discover(
+        Base, include=["User"], config={"User": {"count_mode": "exakt"}}
+    )
+    with pytest.raises(ValueError, match="exakt"):
+        FlaskApiSqlalchemy(registry=registry).init_app(app, db)
+
+
+def test_count_without_statistics(tmp_path):
+    """Test that estimated counts never fall back to an exact count."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'count.db'}"
+    db = SQLAlchemy(app)
+    with app.app_context():
+        Base.metadata.create_all(db.engine, tables=[User.__table__])
+        db.session.add(User(username="counted", email="counted@example.com"))
+        db.session.commit()
+        statements = []
+        event.listen(
+            db.engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        FlaskApiSqlalchemy(
+            registry=ModelRegistry.discover(Base, include=["User"]),
+            paginate=True,
+            count_mode="estimated",
+        ).init_app(app, db)
+    client = app.test_client()
+
+    # Never ANALYZEd, so there is nothing to estimate from
+    response = client.get("/api/users/")
+    assert response.status_code == HTTPStatus.OK
+    assert "X-Total-Count" not in response.headers
+    assert not any("count(" in statement.lower() for statement in statements)
+
+    with app.app_context():
+        db.session.execute(text("ANALYZE"))
+        db.session.commit()
+    assert client.get("/api/users/").headers["X-Total-Count"] == "1"
+
+
+def test_core_reads(client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy):
+    """Test that Core listings match ORM listings without loading ORM objects."""
+    make_api(
+        core_reads=True,
+        fast_serializers=True,
+        paginate=True,
+        page_size=2,
+        streaming=True,
+    )
+    orm_users = [
+        {"id": user.id, "username": user.username}
+        for user in db.session.query(User).order_by(User.id)
+    ]
+    db.session.expunge_all()
+
+    # Walk every page without hydrating ORM objects
+    users = []
+    cursor = None
+    while True:
+        query = {"fields": "id,username"}
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/api/users/", query_string=query)
+        assert response.status_code == HTTPStatus.OK
+        users.extend(response.json["items"])
+        cursor = response.json["next"]
+        if cursor is None:
+            break
+
+    assert users == orm_users
+    assert len(db.session.identity_map) == 0
+
+    # Streams use the same Core path
+    response = client.get("/api/items/", headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.get_data(as_text=True).splitlines()) == (
+        db.session.query(Item).count()
+    )
+    assert len(db.session.identity_map) == 0
+
+
+def random_users(count: int) -> list:
+    """Build payloads for users with random unique names."""
+    users = []
+    for _ in range(count):
+        username = "".join(random.choice(string.ascii_letters) for _ in range(12))
+        users.append(
+            {
+                "username": username,
+                "email": f"{username}@notarealco.com",
+                "is_active": True,
+            }
+        )
+    return users
+
+
+def test_bulk_create_users(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test creating several users from one JSON array."""
+    make_api(bulk_batch_size=2)
+    payload = random_users(5)
+
+    response = client.post("/api/users/", json=payload)
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert [user["username"] for user in response.json] == [
+        user["username"] for user in payload
+    ]
+    assert all(user["id"] is not None for user in response.json)
+    assert db.session.query(User).filter(
+        User.username.in_([user["username"] for user in payload])
+    ).count() == len(payload)
+
+
+def test_bulk_create_users_rejected_rows(client: FlaskClient, api: Api, db: SQLAlchemy):
+    """Test that rejected rows are reported and nothing is written."""
+    before = db.session.query(User).count()
+
+    # Validation failures are reported for every bad row
+    payload = random_users(3)
+    del payload[1]["email"]
+    response = client.post("/api/users/", json=payload)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json["errors"] == [
+        {"index": 1, "message": "Missing required field: email"}
+    ]
+
+    # Database errors are traced back to the offending row
+    payload = random_users(3)
+    payload[2]["username"] = payload[0]["username"]
+    response = client.post("/api/users/", json=payload)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert [error["index"] for error in response.json["errors"]] == [2]
+
+    # So are values the column cannot hold
+    payload = random_users(3)
+    payload[1]["username"] = "x" * 81
+    response = client.post("/api/users/", json=payload)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json["errors"] == [{"index": 1, "message": "Invalid data"}]
+
+    assert db.session.query(User).count() == before
+
+
+def test_bulk_update_and_delete_users(client: FlaskClient, api: Api, db: SQLAlchemy):
+    """Test updating and deleting users selected by ids or by filter."""
+    created = client.post("/api/users/", json=random_users(4)).json
+    ids = [user["id"] for user in created]
+
+    # Update by id list
+    response = client.patch(
+        "/api/users/", json={"ids": ids[:3], "values": {"is_active": False}}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {"affected": 3}
+
+    # Update by filter, combined with ids
+    response = client.patch(
+        "/api/users/",
+        json={
+            "ids": ids[1:],
+            "filter": {"is_active": False},
+            "values": {"is_active": True},
+        },
+    )
+    assert response.json == {"affected": 2}
+    db.session.expire_all()
+    active = {
+        user.id: user.is_active
+        for user in db.session.query(User).filter(User.id.in_(ids))
+    }
+    assert [active[id] for id in ids] == [False, True, True, True]
+
+    # Delete by filter
+    response = client.delete(
+        "/api/users/", json={"filter": {"id__in": ids, "is_active": False}}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {"affected": 1}
+    assert db.session.query(User).filter(User.id.in_(ids)).count() == 3
+
+
+def test_bulk_write_requires_criteria(
+    client: FlaskClient, make_api: Callable[..., Api]
+):
+    """Test that bulk writes never touch the whole table by accident."""
+    make_api(disable_delete=True)
+
+    response = client.patch("/api/users/", json={"values": {"is_active": False}})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    response = client.patch(
+        "/api/users/", json={"filter": {"nope": 1}, "values": {"is_active": False}}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    response = client.patch("/api/users/", json={"ids": [1], "values": {"id": 2}})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    # Deletion stays disabled for the collection too
+    response = client.delete("/api/users/", json={"ids": [1]})
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+def test_fast_writes(client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy):
+    """Test that item updates and deletes are a single statement each."""
+    make_api(fast_writes=True)
+    user = client.post("/api/users/", json=random_users(1)[0]).json
+    url = f"/api/users/{user['id']}"
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.put(url, json={**user, "is_active": False})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json == {**user, "is_active": False}
+
+        response = client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    assert [statement.split()[0] for statement in statements] == ["UPDATE", "DELETE"]
+
+    # Missing rows are detected from the row count
+    assert client.put(url, json=user).status_code == HTTPStatus.NOT_FOUND
+    assert client.delete(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_expand_relationships(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test embedding related objects with a constant number of queries."""
+    make_api(core_reads=True, max_expand_depth=2)
+    user = client.post("/api/users/", json=random_users(1)[0]).json
+    for name in ("first", "second", "third"):
+        client.post("/api/items/", json={"name": name, "user_id": user["id"]})
+    db.session.expunge_all()
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.get(
+            f"/api/items/?user_id={user['id']}&expand=user,user.items&sort=id"
+        )
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    assert response.status_code == HTTPStatus.OK
+    assert [item["name"] for item in response.json] == ["first", "second", "third"]
+    for item in response.json:
+        assert item["user"] == {
+            **user,
+            "items": [
+                {key: value for key, value in row.items() if key != "user"}
+                for row in response.json
+            ],
+        }
+    # One SELECT joining the users, one for their items
+    assert len(statements) == 2
+
+    response = client.get(f"/api/users/{user['id']}?expand=items&fields=id")
+    assert response.json == {
+        "id": user["id"],
+        "items": [
+            {key: value for key, value in row.items() if key != "user"}
+            for row in client.get(f"/api/items/?user_id={user['id']}&sort=id").json
+        ],
+    }
+
+
+def test_expand_rejects_unknown_and_deep_paths(
+    client: FlaskClient, make_api: Callable[..., Api]
+):
+    """Test that expansions are limited to known relationships and the max depth."""
+    make_api(max_expand_depth=1)
+
+    assert client.get("/api/items/?expand=owner").status_code == HTTPStatus.BAD_REQUEST
+    response = client.get("/api/items/?expand=user.items")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert client.get("/api/items/?expand=user").status_code == HTTPStatus.OK
+
+
+def test_batch_get(client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy):
+    """Test fetching items by id in request order, in chunks."""
+    make_api(batch_get_chunk_size=2, core_reads=True)
+    created = client.post("/api/users/", json=random_users(3)).json
+    ids = [user["id"] for user in created]
+    missing = max(ids) + 1000
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.post(
+            "/api/users/batch-get?fields=id,username",
+            json={"ids": [ids[2], missing, ids[0], ids[1], ids[0]]},
+        )
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    assert response.status_code == HTTPStatus.OK
+    by_id = {user["id"]: user for user in created}
+    assert response.json == {
+        "items": [
+            {"id": id, "username": by_id[id]["username"]}
+            for id in (ids[2], ids[0], ids[1], ids[0])
+        ],
+        "missing": [missing],
+    }
+    # Four distinct ids in chunks of two
+    assert len(statements) == 2
+
+    response = client.post("/api/users/batch-get", json={"ids": []})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    response = client.post("/api/users/batch-get", json={"ids": ["abc"]})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.usefixtures("keyed_tables")
+def test_uuid_primary_key(client: FlaskClient, api: Api):
+    """Test item routes of a model keyed by a UUID."""
+    response = client.post("/api/tags/", json={"name": "urgent"})
+    assert response.status_code == HTTPStatus.CREATED
+    tag = response.json
+    url = f"/api/tags/{tag['id']}"
+
+    assert client.get(url).json == tag
+    response = client.put(url, json={"name": "later"})
+    assert response.json == {"id": tag["id"], "name": "later"}
+    assert client.get("/api/tags/not-a-uuid").status_code == HTTPStatus.NOT_FOUND
+
+    unknown = str(uuid.uuid4())
+    response = client.post(
+        "/api/tags/batch-get", json={"ids": [tag["id"].upper(), unknown, unknown]}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {
+        "items": [{"id": tag["id"], "name": "later"}],
+        "missing": [unknown],
+    }
+
+    assert client.delete(url).status_code == HTTPStatus.NO_CONTENT
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.usefixtures("keyed_tables")
+def test_validate_generated_keys(client: FlaskClient, make_api: Callable[..., Api]):
+    """Test that payload validation only requires keys without a default."""
+    make_api(validate=True)
+
+    response = client.post("/api/tags/", json={"name": "x"})
+    assert response.status_code == HTTPStatus.CREATED
+    assert uuid.UUID(response.json["id"])
+    response = client.post("/api/memberships/", json={"role": "admin"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "'user_id' is a required property" in response.json["errors"]["user_id"]
+
+
+@pytest.mark.usefixtures("keyed_tables")
+def test_composite_primary_key(client: FlaskClient, make_api: Callable[..., Api]):
+    """Test item routes with one path segment per key column."""
+    make_api(fast_writes=True)
+    user = client.post("/api/users/", json=random_users(1)[0]).json
+    membership = {"user_id": user["id"], "role": "admin", "note": "founder"}
+
+    response = client.post("/api/memberships/", json={"user_id": user["id"]})
+    assert response.status_code == HTTPStatus.BAD_REQUEST  # role is required
+    response = client.post("/api/memberships/", json=membership)
+    assert response.status_code == HTTPStatus.CREATED
+
+    url = f"/api/memberships/{user['id']}/admin"
+    assert client.get(url).json == membership
+    response = client.put(url, json={"note": "owner"})
+    assert response.json == {**membership, "note": "owner"}
+
+    response = client.post(
+        "/api/memberships/batch-get",
+        json={"ids": [[user["id"], "guest"], [user["id"], "admin"]]},
+    )
+    assert response.json == {
+        "items": [{**membership, "note": "owner"}],
+        "missing": [[user["id"], "guest"]],
+    }
+    response = client.post("/api/memberships/batch-get", json={"ids": [user["id"]]})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    assert client.delete(url).status_code == HTTPStatus.NO_CONTENT
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_lazy_endpoints(
+    app: Flask, client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test that lazy mode builds each model on its first request only."""
+    api = make_api(lazy=True)
+    assert api.namespaces == {} and api.api_models == {}
+
+    user = db.session.query(User).first()
+    response = client.get(f"/api/users/{user.id}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["username"] == user.username
+    assert api._built == {"User"}
+
+    # Expanding a relationship only needs the related model's API model
+    response = client.get("/api/users/", query_string={"expand": "items"})
+    assert response.status_code == HTTPStatus.OK
+    assert "Item" in api.api_models and api._built == {"User"}
+
+    # Errors of endpoints not built yet still come back as JSON
+    response = client.get("/api/items/0")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert "message" in response.json
+
+    # Rendering the spec builds every model
+    with app.test_request_context():
+        specs_url = api.api.specs_url
+    response = client.get(specs_url)
+    assert response.status_code == HTTPStatus.OK
+    assert "/documents/" in response.json["paths"]
+    assert api._built == set(api.models)
+
+
+def test_lazy_requires_restx_internals(
+    make_api: Callable[..., Api], monkeypatch: pytest.MonkeyPatch
+):
+    """Test that lazy mode refuses a Flask-RESTX without the internals it uses."""
+    monkeypatch.delattr(Api, "_configure_namespace_logger")
+    with pytest.raises(RuntimeError, match="_configure_namespace_logger"):
+        make_api(lazy=True)
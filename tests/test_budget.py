@@ -0,0 +1,84 @@
+# tests/test_budget.py
+# Tests for per-request query budgets
+import logging
+from functools import wraps
+from http import HTTPStatus
+from typing import Callable
+
+import pytest
+from flask import Flask
+from flask_api_sqlalchemy.exceptions import QueryBudgetError
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import select
+from tests.conftest import Item, User
+
+
+def create_app(file_app: Callable[..., Flask], **options) -> Flask:
+    """Serve a SQLite database of one user with a query budget.
+
+    Args:
+        file_app (Callable[..., Flask]): `file_app` fixture
+        **options: Further `Api` options
+
+    Returns:
+        Flask: Application
+    """
+
+    def seed(db: SQLAlchemy) -> None:
+        db.session.add(User(username="user", email="user@example.com"))
+        db.session.commit()
+
+    return file_app(include=["User", "Item"], seed=seed, **options)
+
+
+def test_query_headers(file_app: Callable[..., Flask]):
+    """Test that responses report the statements their request ran."""
+    app = create_app(file_app, query_budget=10)
+
+    response = app.test_client().get("/api/users/1")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["X-DB-Queries"] == "1"
+    assert float(response.headers["X-DB-Time"]) > 0
+
+
+def test_query_budget(file_app: Callable[..., Flask], caplog):
+    """Test that requests over their endpoint's budget are logged."""
+    app = create_app(file_app, query_budget={"users_item": 0})
+    client = app.test_client()
+
+    with caplog.at_level(logging.WARNING, logger="flask_api_sqlalchemy.api"):
+        assert client.get("/api/users/1").status_code == HTTPStatus.OK
+        assert client.get("/api/users/").status_code == HTTPStatus.OK
+    assert [record.getMessage() for record in caplog.records] == [
+        "GET /api/users/1 ran 1 SQL statements, over the budget of 0 for users_item"
+    ]
+
+
+def test_query_budget_raise(file_app: Callable[..., Flask]):
+    """Test that requests over budget fail when asked to."""
+    app = create_app(file_app, query_budget=0, query_budget_action="raise")
+    with pytest.raises(QueryBudgetError):
+        app.test_client().get("/api/users/")
+
+
+def test_n_plus_one(file_app: Callable[..., Flask], caplog):
+    """Test that the same statement run again and again is flagged."""
+
+    def load_one_by_one(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            db = app.extensions["sqlalchemy"]
+            for id in range(3):
+                db.session.execute(select(Item).where(Item.user_id == id)).all()
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    app = create_app(file_app, query_budget=10, decorators=[load_one_by_one])
+
+    with caplog.at_level(logging.WARNING, logger="flask_api_sqlalchemy.api"):
+        response = app.test_client().get("/api/users/1")
+    assert response.headers["X-DB-Queries"] == "4"
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 1
+    assert messages[0].startswith("Likely N+1 queries in users_item: 3 x SELECT")
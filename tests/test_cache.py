@@ -0,0 +1,144 @@
+# tests/test_cache.py
+# Tests for the response cache
+import time
+from http import HTTPStatus
+from typing import Callable
+
+from flask.testing import FlaskClient
+from flask_api_sqlalchemy import Api
+from flask_api_sqlalchemy.cache import MemoryCache, RedisCache
+from flask_sqlalchemy import SQLAlchemy
+from tests.conftest import Item, User
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of redis-py the backend uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def test_memory_cache_lru_and_ttl(monkeypatch):
+    """Test eviction of the least recently used entry and expiry."""
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "c"]) == [1, 3]
+
+    now = time.monotonic()
+    cache.set("d", 4, ttl=10)
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("d") is None
+
+
+def test_cached_reads_and_invalidation(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test that reads are cached and writes through the API invalidate them."""
+    make_api(cache=MemoryCache())
+    user = db.session.query(User).first()
+
+    assert client.get("/api/users/").headers["X-Cache"] == "MISS"
+    response = client.get("/api/users/")
+    assert response.headers["X-Cache"] == "HIT"
+    assert any(row["id"] == user.id for row in response.json)
+
+    item_url = f"/api/users/{user.id}"
+    assert client.get(item_url).headers["X-Cache"] == "MISS"
+    assert client.get(item_url).headers["X-Cache"] == "HIT"
+
+    # Different query strings are different entries
+    response = client.get(f"{item_url}?fields=id")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json == {"id": user.id}
+
+    # Updating the item retires both its responses and the listings
+    response = client.put(
+        item_url,
+        json={"username": user.username, "email": user.email, "is_active": False},
+    )
+    assert response.status_code == HTTPStatus.OK
+    response = client.get(item_url)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json["is_active"] is False
+    assert client.get(f"{item_url}?fields=id").headers["X-Cache"] == "MISS"
+    assert client.get("/api/users/").headers["X-Cache"] == "MISS"
+
+    # Bulk writes retire every item
+    client.get(item_url)
+    response = client.patch(
+        "/api/users/", json={"ids": [user.id], "values": {"is_active": True}}
+    )
+    assert response.json == {"affected": 1}
+    response = client.get(item_url)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json["is_active"] is True
+
+    # Errors are not cached
+    assert client.get("/api/users/0").status_code == HTTPStatus.NOT_FOUND
+    assert "X-Cache" not in client.get("/api/users/0").headers
+
+
+def test_cached_expansion_invalidation(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test that writes to embedded models retire expanded responses."""
+    make_api(cache=MemoryCache())
+    user = db.session.query(User).first()
+    item = Item(name="Cached item", user=user)
+    db.session.add(item)
+    db.session.commit()
+
+    url = f"/api/users/{user.id}?expand=items"
+    assert client.get(url).headers["X-Cache"] == "MISS"
+    assert client.get(url).headers["X-Cache"] == "HIT"
+
+    response = client.put(
+        f"/api/items/{item.id}", json={"name": "Renamed item", "user_id": user.id}
+    )
+    assert response.status_code == HTTPStatus.OK
+    response = client.get(url)
+    assert response.headers["X-Cache"] == "MISS"
+    names = [embedded["name"] for embedded in response.json["items"]]
+    assert "Renamed item" in names and "Cached item" not in names
+
+
+def test_redis_cache_backend(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test the Redis backend against a fake client."""
+    redis = FakeRedis()
+    make_api(cache=RedisCache(redis, prefix="test:"))
+
+    first = client.get("/api/items/")
+    second = client.get("/api/items/")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json == first.json
+    assert all(key.startswith("test:Item:") for key in redis.data)
+
+    response = client.post(
+        "/api/items/",
+        json={"name": "cached", "user_id": db.session.query(User).first().id},
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    response = client.get("/api/items/")
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(response.json) == len(first.json) + 1
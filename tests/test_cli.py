@@ -0,0 +1,74 @@
+# tests/test_cli.py
+# Tests for the command-line interface
+import json
+import sys
+
+import pytest
+from flask_api_sqlalchemy import Api
+from flask_api_sqlalchemy.cli import main
+
+APP_MODULE = """
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from flask_api_sqlalchemy import Api
+
+app = Flask(__name__)
+app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///cli.db"
+db = SQLAlchemy(app)
+
+
+class Widget(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(80), nullable=False)
+
+
+Api().init_app(app, db)
+"""
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Write an application module to a temporary working directory.
+
+    Returns:
+        str: Path of its app, as the CLI takes it
+    """
+    (tmp_path / "cli_app.py").write_text(APP_MODULE)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delitem(sys.modules, "cli_app", raising=False)
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    return "cli_app:app"
+
+
+def test_export_spec(app_module: str, tmp_path, capsys: pytest.CaptureFixture):
+    """Test that export-spec writes the Swagger spec of the application."""
+    output = tmp_path / "build" / "swagger.json"
+    output.parent.mkdir()
+
+    assert main(["export-spec", app_module, "--output", str(output)]) == 0
+    assert "/widgets/" in json.loads(output.read_text())["paths"]
+    assert str(output) in capsys.readouterr().out
+
+
+def test_export_spec_errors(
+    app_module: str, tmp_path, monkeypatch: pytest.MonkeyPatch, capsys
+):
+    """Test that export-spec fails with exit code 1 instead of a traceback."""
+    output = tmp_path / "swagger.json"
+
+    assert main(["export-spec", "cli_app:missing", "--output", str(output)]) == 1
+    assert main(["export-spec", app_module, "--output", str(tmp_path)]) == 1
+
+    monkeypatch.setattr(Api, "_generate_spec", lambda self: None)
+    assert main(["export-spec", app_module, "--output", str(output)]) == 1
+    assert "Unable to render the Swagger spec" in capsys.readouterr().out
+    assert not output.exists()
+
+
+def test_info(app_module: str, capsys: pytest.CaptureFixture):
+    """Test that info lists the models of the application."""
+    assert main(["info", app_module]) == 0
+    assert "  - Widget" in capsys.readouterr().out
+
+    main(["info", "cli_app"])
+    assert "Invalid app module format" in capsys.readouterr().out
@@ -0,0 +1,241 @@
+# tests/test_conditional.py
+# Tests for ETag and Last-Modified conditional GETs
+from http import HTTPStatus
+from typing import Callable
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from flask_api_sqlalchemy import Api
+from flask_api_sqlalchemy.exceptions import ModelMappingError
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Column, Integer, String, event
+from sqlalchemy.orm import declarative_base
+from tests.conftest import Document, Item
+
+# Documents are versioned by their update timestamp
+VERSIONED = {"Document": {"version_column": "updated_at"}}
+
+LocalBase = declarative_base()
+
+
+class Thing(LocalBase):
+    """Model with a `version` column that nothing maintains."""
+
+    __tablename__ = "thing"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    rank = Column(Integer)
+    version = Column(String(20))
+
+
+class Note(LocalBase):
+    """Model versioned by the mapper."""
+
+    __tablename__ = "note"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(50), nullable=False)
+    vid = Column(Integer, nullable=False)
+
+    __mapper_args__ = {"version_id_col": vid}
+
+
+def seed_things(db: SQLAlchemy) -> None:
+    """Add one `Thing` and one `Note`."""
+    db.session.add_all([Thing(id=1, name="t0", version="1.0"), Note(id=1, title="n0")])
+    db.session.commit()
+
+
+def test_item_etag_from_version_column(
+    client: FlaskClient,
+    make_api: Callable[..., Api],
+    db: SQLAlchemy,
+    document: Document,
+):
+    """Test that versioned items answer 304 without loading the row."""
+    make_api(etags=True, model_config=VERSIONED)
+    url = f"/api/documents/{document.id}"
+
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.get(url, headers={"If-None-Match": etag})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.data == b""
+    assert len(statements) == 1 and "title" not in statements[0]
+
+    response = client.get(url, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    # Other representations have other tags
+    response = client.get(f"{url}?fields=id", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+
+    # A write changes the version, hence the tag
+    response = client.put(url, json={"title": "Annual report"})
+    assert response.status_code == HTTPStatus.OK
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["title"] == "Annual report"
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_from_payload_hash(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test that listings and unversioned items are tagged by content."""
+    make_api(etags=True)
+
+    response = client.get("/api/items/")
+    etag = response.headers["ETag"]
+    response = client.get("/api/items/", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert client.get("/api/items/?fields=id").headers["ETag"] != etag
+
+    url = f"/api/items/{db.session.query(Item).first().id}"
+    etag = client.get(url).headers["ETag"]
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    # Errors carry no validators
+    response = client.get("/api/items/0")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert "ETag" not in response.headers
+
+
+def test_versioned_put_if_match(
+    client: FlaskClient,
+    make_api: Callable[..., Api],
+    db: SQLAlchemy,
+    document: Document,
+):
+    """Test that updates of versioned items are one conditional UPDATE."""
+    make_api(etags=True, model_config=VERSIONED)
+    url = f"/api/documents/{document.id}"
+    etag = client.get(url).headers["ETag"]
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.put(
+            url, json={"title": "Draft 2"}, headers={"If-Match": etag}
+        )
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["title"] == "Draft 2"
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE") and "updated_at" in statements[0]
+
+    # The tag is now out of date
+    response = client.put(url, json={"title": "Draft 3"}, headers={"If-Match": etag})
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+    response = client.put(url, json={"title": "Draft 3"}, headers={"If-Match": '"x"'})
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+
+    db.session.expire_all()
+    assert db.session.get(Document, document.id).title == "Draft 2"
+
+    # Only version_id_col versions are read from the payload
+    stale = {"title": "Draft 3", "updated_at": "2000-01-01T00:00:00"}
+    response = client.put(url, json=stale)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["title"] == "Draft 3"
+
+    response = client.put(
+        "/api/documents/0", json={"title": "Draft 3"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_unversioned_put_if_match(
+    client: FlaskClient, make_api: Callable[..., Api], db: SQLAlchemy
+):
+    """Test If-Match against the content tag of an unversioned item."""
+    make_api(etags=True)
+    item = db.session.query(Item).first()
+    url = f"/api/items/{item.id}"
+    etag = client.get(url).headers["ETag"]
+    payload = {"name": f"{item.name} (renamed)", "user_id": item.user_id}
+
+    response = client.put(url, json=payload, headers={"If-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+
+    payload["name"] = "Renamed again"
+    response = client.put(url, json=payload, headers={"If-Match": etag})
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+
+
+def test_version_column_is_opt_in(file_app: Callable[..., Flask]):
+    """Test that columns named like versions are not trusted by default."""
+    app = file_app(LocalBase, seed=seed_things, etags=True)
+    client = app.test_client()
+
+    etag = client.get("/api/things/1").headers["ETag"]
+    assert client.put("/api/things/1", json={"name": "t1"}).status_code == 200
+    response = client.get("/api/things/1", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["name"] == "t1"
+
+    # Opting in needs a column every write moves forward
+    with pytest.raises(ModelMappingError):
+        file_app(
+            LocalBase,
+            config={"Thing": {"version_column": "version"}},
+            seed=seed_things,
+            etags=True,
+        )
+
+
+def test_put_without_preconditions(file_app: Callable[..., Flask]):
+    """Test that plain PUTs set any field and reject bad values."""
+    client = file_app(LocalBase, seed=seed_things).test_client()
+
+    response = client.put("/api/things/1", json={"name": "t0", "version": "2.0"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["version"] == "2.0"
+
+    response = client.put("/api/things/1", json={"rank": "abc"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    # Single-statement updates reject them too
+    client = file_app(LocalBase, seed=seed_things, fast_writes=True).test_client()
+    response = client.put("/api/things/1", json={"rank": "abc"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_bulk_update_moves_version(file_app: Callable[..., Flask]):
+    """Test that collection PATCHes make earlier tags and versions stale."""
+    client = file_app(LocalBase, seed=seed_things, etags=True).test_client()
+    etag = client.get("/api/notes/1").headers["ETag"]
+
+    response = client.patch("/api/notes/", json={"ids": [1], "values": {"title": "b"}})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["affected"] == 1
+
+    response = client.get("/api/notes/1", headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["vid"] == 2
+
+    response = client.put(
+        "/api/notes/1", json={"title": "lost"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
@@ -1,5 +1,8 @@
 # tests/test_extension.py
 # Tests for the API extension
+import json
+from http import HTTPStatus
+
 from flask import Flask
 from flask_api_sqlalchemy import Api
 from flask_sqlalchemy import SQLAlchemy
@@ -104,3 +107,34 @@ def test_all_types_table(app: Flask, db: SQLAlchemy, api: Api) -> None:
 
     for column in columns:
         assert column in api_model
+
+
+def test_cached_spec(app: Flask, db: SQLAlchemy, tmp_path) -> None:
+    """Test serving the Swagger spec once computed, and from an exported file."""
+    api = Api()
+    api.init_app(app, db)
+    client = app.test_client()
+    with app.test_request_context():
+        specs_url = api.api.specs_url
+
+    response = client.get(specs_url)
+    assert response.status_code == HTTPStatus.OK
+    assert "/users/" in response.json["paths"]
+    etag = response.headers["ETag"]
+    assert client.get(specs_url).get_data() == response.get_data()
+
+    response = client.get(specs_url, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    # Workers given the exported file serve it as is
+    path = tmp_path / "swagger.json"
+    api.export_spec(str(path))
+    assert json.loads(path.read_bytes()) == client.get(specs_url).json
+
+    path.write_text('{"swagger": "2.0", "paths": {}}')
+    other_app = Flask(__name__)
+    other_app.config.update(app.config)
+    other = Api(spec_file=str(path))
+    other.init_app(other_app, db)
+    response = other_app.test_client().get(specs_url)
+    assert response.json == {"swagger": "2.0", "paths": {}}
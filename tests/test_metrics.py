@@ -0,0 +1,77 @@
+# tests/test_metrics.py
+# Tests for the metrics of the generated endpoints
+import threading
+from http import HTTPStatus
+from typing import Callable
+
+from flask import Flask
+from flask_api_sqlalchemy.metrics import Metrics
+from flask_sqlalchemy import SQLAlchemy
+from tests.conftest import User
+
+
+def seed_users(db: SQLAlchemy) -> None:
+    """Add three users."""
+    db.session.add_all(
+        User(username=f"user{index}", email=f"user{index}@example.com")
+        for index in range(3)
+    )
+    db.session.commit()
+
+
+def test_metrics_endpoint(file_app: Callable[..., Flask]):
+    """Test that requests to generated endpoints show up in /metrics."""
+    app = file_app(
+        include=["User", "Item"],
+        seed=seed_users,
+        metrics=True,
+        metrics_buckets=[0.1, 1],
+    )
+    client = app.test_client()
+
+    assert client.get("/api/users/").status_code == HTTPStatus.OK
+    assert client.get("/api/users/1").status_code == HTTPStatus.OK
+    assert client.get("/api/users/99").status_code == HTTPStatus.NOT_FOUND
+
+    response = client.get("/metrics")
+    assert response.status_code == HTTPStatus.OK
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    labels = 'model="User",method="GET"'
+    assert f'api_requests_total{{{labels},status="200"}} 2' in lines
+    assert f'api_requests_total{{{labels},status="404"}} 1' in lines
+    assert f"api_rows_returned_total{{{labels}}} 4" in lines
+    for phase in ("total", "db", "serialize"):
+        phase_labels = f'{labels},phase="{phase}"'
+        assert (
+            f'api_request_duration_seconds_bucket{{{phase_labels},le="+Inf"}} 3'
+            in lines
+        )
+        assert f"api_request_duration_seconds_count{{{phase_labels}}} 3" in lines
+    assert any(
+        line.startswith(f"api_response_bytes_total{{{labels}}}") for line in lines
+    )
+
+
+def test_metrics_threads():
+    """Test that counts recorded by several threads add up."""
+    metrics = Metrics(buckets=[1, 2])
+    labels = (("model", "User"),)
+
+    def record():
+        for _ in range(1000):
+            metrics.inc("api_rows_returned_total", labels)
+            metrics.observe("api_request_duration_seconds", labels, 1.5)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = metrics.render().splitlines()
+    assert 'api_rows_returned_total{model="User"} 4000' in lines
+    assert 'api_request_duration_seconds_bucket{model="User",le="1"} 0' in lines
+    assert 'api_request_duration_seconds_bucket{model="User",le="2"} 4000' in lines
+    assert 'api_request_duration_seconds_sum{model="User"} 6000' in lines
+    assert 'api_request_duration_seconds_count{model="User"} 4000' in lines
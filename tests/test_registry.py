@@ -0,0 +1,202 @@
+# tests/test_registry.py
+# Tests for model discovery and the model registry
+import pickle
+from http import HTTPStatus
+from typing import Callable
+
+import pytest
+from flask import Flask
+from flask_api_sqlalchemy import Api
+from flask_api_sqlalchemy.exceptions import ModelDiscoveryError
+from flask_api_sqlalchemy.registry import ModelRegistry
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String
+from sqlalchemy.orm import declarative_base, relationship
+from tests.conftest import User
+
+
+def test_discover_through_abstract_bases_and_mixins():
+    """Test finding models that are not direct subclasses of the base."""
+    Base = declarative_base()
+
+    class Named:
+        name = Column(String(50))
+
+    class Entity(Base):
+        __abstract__ = True
+        id = Column(Integer, primary_key=True)
+
+    class Invoice(Named, Entity):
+        __tablename__ = "invoice"
+
+    class Receipt(Invoice):
+        __tablename__ = None  # Single table inheritance
+        __mapper_args__ = {"polymorphic_identity": "receipt"}
+
+    class _Private(Entity):
+        __tablename__ = "private"
+
+    registry = ModelRegistry.discover(Base)
+    assert registry.models == {"Invoice": Invoice, "Receipt": Receipt}
+
+    registry = ModelRegistry.discover(Base, include=["In*", "Rec*"], exclude=["Rec*"])
+    assert list(registry.models) == ["Invoice"]
+
+
+def test_name_collisions():
+    """Test that models with the same name must be renamed apart."""
+    Base = declarative_base()
+
+    def define(module):
+        return type(
+            "Event",
+            (Base,),
+            {
+                "__module__": module,
+                "__tablename__": module.replace(".", "_"),
+                "id": Column(Integer, primary_key=True),
+            },
+        )
+
+    first, second = define("billing.events"), define("audit.events")
+    with pytest.raises(ModelDiscoveryError, match="both named Event"):
+        ModelRegistry.discover(Base)
+
+    registry = ModelRegistry.discover(
+        Base, config={"audit.events.Event": {"name": "AuditEvent"}}
+    )
+    assert registry.models == {"AuditEvent": second, "Event": first}
+
+
+def test_renamed_model_endpoints(file_app: Callable[..., Flask]):
+    """Test the endpoints of a renamed model sharing its class name."""
+    Base = declarative_base()
+    classes = {}
+    for module, column in (("billing.events", "amount"), ("audit.events", "actor")):
+        classes[module] = type(
+            "Event",
+            (Base,),
+            {
+                "__module__": module,
+                "__tablename__": module.replace(".", "_"),
+                "id": Column(Integer, primary_key=True),
+                column: Column(String(50)),
+            },
+        )
+
+    class Account(Base):
+        __tablename__ = "account"
+
+        id = Column(Integer, primary_key=True)
+        event_id = Column(Integer, ForeignKey("audit_events.id"))
+        event = relationship(classes["audit.events"])
+
+    def seed(db: SQLAlchemy) -> None:
+        db.session.add(Account(id=1, event=classes["audit.events"](id=1, actor="ann")))
+        db.session.commit()
+
+    client = file_app(
+        Base,
+        config={"audit.events.Event": {"name": "AuditEvent"}},
+        seed=seed,
+        fast_writes=True,
+        max_expand_depth=1,
+    ).test_client()
+    url = "/api/auditevents/"
+
+    response = client.post(url, json=[{"actor": "bob"}, {"actor": "cat"}])
+    assert response.status_code == HTTPStatus.CREATED
+    assert [event["actor"] for event in response.json] == ["bob", "cat"]
+    assert [event["actor"] for event in client.get(url).json] == ["ann", "bob", "cat"]
+
+    response = client.patch(url, json={"ids": [2], "values": {"actor": "bo"}})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {"affected": 1}
+
+    response = client.post(f"{url}batch-get", json={"ids": [1, 2, 9]})
+    assert response.status_code == HTTPStatus.OK
+    assert [event["actor"] for event in response.json["items"]] == ["ann", "bo"]
+    assert response.json["missing"] == [9]
+
+    response = client.put(f"{url}3", json={"actor": "cy"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {"id": 3, "actor": "cy"}
+    assert client.delete(f"{url}3").status_code == HTTPStatus.NO_CONTENT
+
+    response = client.get("/api/accounts/1", query_string={"expand": "event"})
+    assert response.json["event"] == {"id": 1, "actor": "ann"}
+
+
+def test_shared_registry(app: Flask, db: SQLAlchemy):
+    """Test sharing one pickled registry and its per-model options."""
+    registry = ModelRegistry.discover(
+        db.Model, include=["User", "Item"], config={"Item": {"disable_delete": True}}
+    )
+    assert list(registry.models) == ["Item", "User"]
+    copy = pickle.loads(pickle.dumps(registry))
+    assert copy.models == registry.models and copy.config == registry.config
+    registry = copy
+
+    apps = []
+    for _ in range(2):
+        other = Flask(__name__)
+        other.config.update(app.config)
+        db.init_app(other)
+        api = Api(registry=registry)
+        api.init_app(other, db)
+        assert api.models == registry.models
+        apps.append(other)
+
+    item = db.session.query(registry.models["Item"]).first()
+    for other in apps:
+        client = other.test_client()
+        assert client.get(f"/api/items/{item.id}").status_code == HTTPStatus.OK
+        response = client.delete(f"/api/items/{item.id}")
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+        assert client.get("/api/alltypes/").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_reflected_tables(
+    app: Flask, db: SQLAlchemy, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test serving tables without declared models, with cached reflection."""
+    cache_file = str(tmp_path / "reflection.pickle")
+    api = Api(
+        reflect=True,
+        reflect_tables=["user", "item"],
+        reflection_cache=cache_file,
+        core_reads=True,
+        fast_writes=True,
+    )
+    api.init_app(app, db)
+    assert list(api.models) == ["Item", "User"]
+    assert api.models["User"].__doc__ == "Reflected user"
+
+    client = app.test_client()
+    user = db.session.query(User).first()
+    response = client.get(f"/api/users/{user.id}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["username"] == user.username
+
+    response = client.post("/api/items/", json={"name": "Lamp", "user_id": user.id})
+    assert response.status_code == HTTPStatus.CREATED
+    item_id = response.json["id"]
+    response = client.put(
+        f"/api/items/{item_id}", json={"name": "Desk lamp", "user_id": user.id}
+    )
+    assert response.json["name"] == "Desk lamp"
+    assert client.delete(f"/api/items/{item_id}").status_code == HTTPStatus.NO_CONTENT
+
+    # Restarts read the cached tables instead of the catalog
+    def reflect(*args, **kwargs):
+        raise AssertionError("reflected again")
+
+    monkeypatch.setattr(MetaData, "reflect", reflect)
+    registry = ModelRegistry.reflect(
+        db.engine, tables=["item", "user"], cache_file=cache_file
+    )
+    assert list(registry.models) == ["Item", "User"]
+
+    # Reflected registries are mapped again when unpickled
+    copy = pickle.loads(pickle.dumps(registry))
+    assert list(copy.models) == ["Item", "User"]
@@ -0,0 +1,190 @@
+# tests/test_replicas.py
+# Tests for read-replica routing
+import time
+from http import HTTPStatus
+from typing import Callable, Tuple
+
+import pytest
+from flask import Flask
+from flask_api_sqlalchemy import Api
+from flask_api_sqlalchemy.api import READ_PRIMARY_COOKIE
+from flask_api_sqlalchemy.cache import MemoryCache
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Column, Integer, String, event, text
+from sqlalchemy.orm import declarative_base
+from tests.conftest import User
+
+
+LocalBase = declarative_base()
+
+
+class Counter(LocalBase):
+    __tablename__ = "counter"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    version = Column(Integer, nullable=False)
+
+    __mapper_args__ = {"version_id_col": version}
+
+
+def seed_users(db: SQLAlchemy) -> None:
+    """Give the primary and the replica a different user 1."""
+    for key, username in ((None, "primary"), ("replica", "replica")):
+        with db.engines[key].begin() as connection:
+            connection.execute(
+                User.__table__.insert(),
+                {"id": 1, "username": username, "email": f"{username}@example.com"},
+            )
+
+
+def seed_counters(db: SQLAlchemy) -> None:
+    """Give the replica an older version of counter 1 than the primary."""
+    for key, name, version in ((None, "new", 2), ("replica", "old", 1)):
+        with db.engines[key].begin() as connection:
+            connection.execute(
+                Counter.__table__.insert(), {"id": 1, "name": name, "version": version}
+            )
+
+
+def create_replicated(file_app: Callable[..., Flask], **options) -> Flask:
+    """Serve users from a primary and a replica SQLite file.
+
+    Args:
+        file_app (Callable[..., Flask]): `file_app` fixture
+        **options: Further `Api` options
+
+    Returns:
+        Flask: Application
+    """
+    return file_app(
+        include=["User", "Item"],
+        binds=["replica"],
+        seed=seed_users,
+        read_replicas=["replica"],
+        **options,
+    )
+
+
+@pytest.fixture
+def replicated(file_app: Callable[..., Flask]) -> Tuple[Flask, SQLAlchemy, Api]:
+    """Serve a primary and a replica with the default options.
+
+    Returns:
+        Tuple[Flask, SQLAlchemy, Api]: App, database and API extension
+    """
+    app = create_replicated(file_app)
+    return app, app.extensions["sqlalchemy"], app.extensions["flask-api-sqlalchemy"]
+
+
+def pin_to_primary(client) -> None:
+    """Give a client the cookie it gets after a write."""
+    client.set_cookie(READ_PRIMARY_COOKIE, str(int(time.time()) + 60))
+
+
+def test_replica_reads(replicated: Tuple[Flask, SQLAlchemy, Api]):
+    """Test that GETs read the replica until the client writes."""
+    app, _, _ = replicated
+    client = app.test_client()
+
+    response = client.get("/api/users/")
+    assert response.status_code == HTTPStatus.OK
+    assert [user["username"] for user in response.json] == ["replica"]
+    assert client.get("/api/users/1").json["username"] == "replica"
+
+    response = client.post(
+        "/api/users/",
+        json={
+            "username": "writer",
+            "email": "writer@example.com",
+            "is_active": True,
+        },
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert client.get_cookie(READ_PRIMARY_COOKIE) is not None
+
+    # The writer sees its own write, other clients keep reading the replica
+    usernames = [user["username"] for user in client.get("/api/users/").json]
+    assert usernames == ["primary", "writer"]
+    usernames = [user["username"] for user in app.test_client().get("/api/users/").json]
+    assert usernames == ["replica"]
+
+
+def test_replica_failover(replicated: Tuple[Flask, SQLAlchemy, Api]):
+    """Test that a failing replica is left out and reads use the primary."""
+    app, db, api = replicated
+    client = app.test_client()
+
+    with app.app_context():
+        replica = db.engines["replica"]
+        with replica.begin() as connection:
+            connection.execute(text('DROP TABLE "item"'))
+            connection.execute(text('DROP TABLE "user"'))
+        statements = []
+        event.listen(
+            replica,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+    response = client.get("/api/users/1")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["username"] == "primary"
+    assert list(api._replicas_down) == [0]
+
+    tried = len(statements)
+    assert client.get("/api/users/1").json["username"] == "primary"
+    assert len(statements) == tried
+
+
+def test_replica_cache_read_your_writes(file_app: Callable[..., Flask]):
+    """Test that lagging replica reads never answer the writer from cache."""
+    app = create_replicated(file_app, cache=MemoryCache())
+    writer, reader = app.test_client(), app.test_client()
+
+    assert reader.get("/api/users/1").headers["X-Cache"] == "MISS"
+    assert reader.get("/api/users/1").headers["X-Cache"] == "HIT"
+
+    response = writer.put(
+        "/api/users/1",
+        json={"username": "renamed", "email": "renamed@example.com", "is_active": True},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    # The replica lags: its answer is served but not cached
+    response = reader.get("/api/users/1")
+    assert response.json["username"] == "replica"
+    assert response.headers["X-Cache"] == "MISS"
+    assert reader.get("/api/users/1").headers["X-Cache"] == "MISS"
+
+    response = writer.get("/api/users/1")
+    assert response.json["username"] == "renamed"
+    assert "X-Cache" not in response.headers
+
+
+def test_replica_etags(file_app: Callable[..., Flask]):
+    """Test that ETags carry the version of the row the body was read from."""
+    app = file_app(
+        LocalBase,
+        binds=["replica"],
+        seed=seed_counters,
+        read_replicas=["replica"],
+        etags=True,
+    )
+
+    client, pinned = app.test_client(), app.test_client()
+    pin_to_primary(pinned)
+
+    response = client.get("/api/counters/1")
+    assert response.json["name"] == "old"
+    replica_tag = response.headers["ETag"]
+    response = pinned.get("/api/counters/1")
+    assert response.json["name"] == "new"
+    primary_tag = response.headers["ETag"]
+    assert replica_tag != primary_tag
+
+    response = client.get("/api/counters/1", headers={"If-None-Match": primary_tag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] == replica_tag
+    response = client.get("/api/counters/1", headers={"If-None-Match": replica_tag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
@@ -0,0 +1,80 @@
+# tests/test_serializers.py
+# Tests for the precompiled serializers
+from http import HTTPStatus
+from typing import Callable
+
+import pytest
+
+from flask import Flask
+from flask.testing import FlaskClient
+from flask_api_sqlalchemy import Api
+from flask_api_sqlalchemy.serializers import compile_serializer
+from flask_restx import fields, marshal
+from flask_sqlalchemy import SQLAlchemy
+from tests.conftest import AllTypes, Item, User
+
+
+def test_compiled_serializer_matches_marshal(api: Api, db: SQLAlchemy):
+    """Test that compiled serializers produce the same output as marshal."""
+    for model in (User, Item, AllTypes):
+        api_model = api.api_models[model.__name__]
+        serialize = compile_serializer(api_model)
+
+        rows = db.session.query(model).all()
+        assert rows
+        for row in rows:
+            assert serialize(row) == marshal(row, api_model)
+
+
+def test_compiled_serializer_special_fields():
+    """Test fields that keep their own output logic and missing attributes."""
+
+    class Record:
+        id = "7"
+        name = None
+
+    model_fields = {
+        "id": fields.Integer(),
+        "name": fields.String(default="anonymous"),
+        "tags": fields.List(fields.String),
+        "missing": fields.Float(),
+        "renamed": fields.Integer(attribute="id"),
+    }
+
+    serialize = compile_serializer(model_fields)
+    assert serialize(Record()) == marshal(Record(), model_fields)
+    assert serialize(Record()) == {
+        "id": 7,
+        "name": "anonymous",
+        "tags": None,
+        "missing": None,
+        "renamed": 7,
+    }
+
+
+def test_fast_serializer_responses(
+    app: Flask,
+    client: FlaskClient,
+    make_api: Callable[..., Api],
+    db: SQLAlchemy,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that API responses are unchanged with fast serializers enabled."""
+    api = make_api(fast_serializers=True)
+    assert set(api.serializers) >= {"User", "Item", "AllTypes"}
+
+    response = client.get("/api/users/")
+    assert response.status_code == HTTPStatus.OK
+    users = db.session.query(User).all()
+    assert response.json == marshal(users, api.api_models["User"])
+
+    # The model's own fields use the serializers compiled at startup
+    with app.test_request_context():
+        assert api._serializer(api.api_models["User"]) is api.serializers["User"]
+    monkeypatch.setattr("flask_api_sqlalchemy.api.compile_serializer", None)
+    assert client.get("/api/users/").json == response.json
+    monkeypatch.undo()
+
+    # The field mask header still applies
+    response = client.get("/api/users/", headers={"X-Fields": "id,email"})
+    assert all(set(user) == {"id", "email"} for user in response.json)